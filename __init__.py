@@ -3,9 +3,24 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from dataclasses import dataclass
-from datetime import timedelta
-from typing import Callable, Optional, cast
+import math
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+    cast,
+)
 
 import homeassistant.helpers.config_validation as cv
 import homeassistant.helpers.device_registry as device_registry
@@ -14,12 +29,17 @@ from homeassistant import config_entries
 from homeassistant.components import persistent_notification
 from homeassistant.const import CONF_NAME
 from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.reload import async_integration_yaml_config
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from nibeuplink import Uplink, UplinkSession
-from nibeuplink.typing import ParameterId, ParameterType, System, SystemSoftwareInfo
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    ACTIVITY_CADENCE_WEIGHT,
+    ACTIVITY_OVERDUE_FACTOR,
     CONF_ACCESS_DATA,
+    CONF_BACKGROUND_SETUP,
     CONF_BINARY_SENSORS,
     CONF_CLIENT_ID,
     CONF_CLIENT_SECRET,
@@ -27,26 +47,82 @@ from .const import (
     CONF_CLIMATES,
     CONF_CURRENT_TEMPERATURE,
     CONF_FANS,
+    CONF_MAX_AGE,
+    CONF_PARAMETER_MAX_AGE,
+    CONF_PARAMETER_REFRESH,
+    CONF_PARAMETER_SLICES,
+    CONF_PARAMETERS,
     CONF_REDIRECT_URI,
+    CONF_REFRESH_ON_ACTIVITY,
+    CONF_REQUESTS_PER_MINUTE,
     CONF_SENSORS,
+    CONF_SLOW_UPDATE_INTERVAL,
     CONF_SWITCHES,
     CONF_SYSTEM,
     CONF_SYSTEMS,
     CONF_THERMOSTATS,
     CONF_UNITS,
+    CONF_UNLOAD_TIMEOUT,
+    CONF_UPDATE_INTERVAL,
     CONF_VALVE_POSITION,
     CONF_WATER_HEATERS,
     CONF_WRITEACCESS,
+    CONNECTION_OFFLINE,
+    DATA_NIBE_BUDGETS,
     DATA_NIBE_CONFIG,
     DATA_NIBE_ENTRIES,
+    DATA_NIBE_PARAMETERS,
+    DATA_NIBE_SYSTEMS,
+    DATA_NIBE_TOPOLOGY,
+    DEFAULT_UNLOAD_TIMEOUT,
+    DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    PARAMETER_MIN_AGE,
+    REFRESH_CATEGORY,
+    REFRESH_PARAMETER,
     SCAN_INTERVAL,
+    SETUP_CONCURRENCY,
+    SIGNAL_CONFIG_UPDATED,
+    SIGNAL_SYSTEM_ADDED,
+    SIGNAL_SYSTEM_UNLOADED,
+    TOPOLOGY_KEYS,
 )
-from .services import async_register_services
+from .resilience import CircuitBreaker, async_retry
+from .storage import NibeParameterCache, NibeSystemsCache, NibeTopology
+from .throttle import BUDGET_PER_MINUTE, AdaptiveThrottle, RequestBudget
+
+if TYPE_CHECKING:
+    from nibeuplink import (
+        ClimateSystem,
+        HotWaterSystem,
+        Uplink,
+        UplinkSession,
+        VentilationSystem,
+    )
+    from nibeuplink.typing import (
+        ParameterId,
+        ParameterType,
+        System,
+        SystemSoftwareInfo,
+        SystemUnit,
+    )
+
+    ParameterSet = dict[ParameterId, Optional[ParameterType]]
 
 _LOGGER = logging.getLogger(__name__)
 
-ParameterSet = dict[ParameterId, Optional[ParameterType]]
+_T = TypeVar("_T")
+
+
+async def gather_limited(limit: int, *aws: Awaitable[_T]) -> list[_T]:
+    """Gather awaitables, running at most limit of them at the same time."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(aw: Awaitable[_T]) -> _T:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*[_run(aw) for aw in aws])
 
 
 def ensure_system_dict(value: dict[int, dict] | list[dict] | None) -> dict[int, dict]:
@@ -78,6 +154,13 @@ THERMOSTAT_SCHEMA = vol.Schema(
     }
 )
 
+MAX_AGE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_PARAMETERS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(CONF_MAX_AGE): cv.time_period,
+    }
+)
+
 SYSTEM_SCHEMA = vol.Schema(
     vol.All(
         cv.deprecated(CONF_CLIMATES),
@@ -102,6 +185,22 @@ SYSTEM_SCHEMA = vol.Schema(
             vol.Optional(CONF_THERMOSTATS, default={}): {
                 cv.positive_int: THERMOSTAT_SCHEMA
             },
+            vol.Optional(CONF_PARAMETER_REFRESH, default=REFRESH_PARAMETER): vol.In(
+                [REFRESH_PARAMETER, REFRESH_CATEGORY]
+            ),
+            vol.Optional(
+                CONF_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL
+            ): cv.time_period,
+            vol.Optional(
+                CONF_SLOW_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL
+            ): cv.time_period,
+            vol.Optional(CONF_PARAMETER_MAX_AGE, default=[]): vol.All(
+                cv.ensure_list, [MAX_AGE_SCHEMA]
+            ),
+            vol.Optional(CONF_PARAMETER_SLICES, default=1): vol.All(
+                vol.Coerce(int), vol.Range(min=1)
+            ),
+            vol.Optional(CONF_REFRESH_ON_ACTIVITY, default=False): cv.boolean,
         },
     )
 )
@@ -115,11 +214,25 @@ NIBE_SCHEMA = vol.Schema(
         vol.Optional(CONF_SYSTEMS, default={}): vol.All(
             ensure_system_dict, {vol.Coerce(int): SYSTEM_SCHEMA}
         ),
+        vol.Optional(
+            CONF_UNLOAD_TIMEOUT, default=DEFAULT_UNLOAD_TIMEOUT
+        ): cv.time_period,
+        vol.Optional(CONF_REQUESTS_PER_MINUTE, default=BUDGET_PER_MINUTE): vol.All(
+            vol.Coerce(float), vol.Range(min=1)
+        ),
     }
 )
 
 CONFIG_SCHEMA = vol.Schema({DOMAIN: NIBE_SCHEMA}, extra=vol.ALLOW_EXTRA)
 
+# System configuration that entities are created from
+CONFIG_ENTITY_KEYS = (
+    CONF_SENSORS,
+    CONF_SWITCHES,
+    CONF_BINARY_SENSORS,
+    CONF_THERMOSTATS,
+)
+
 FORWARD_PLATFORMS = (
     "climate",
     "switch",
@@ -131,6 +244,21 @@ FORWARD_PLATFORMS = (
 )
 
 
+def _get_platforms(systems: list[NibeSystem]) -> list[str]:
+    """Return the platforms that will have entities for the systems."""
+    platforms = {"sensor", "switch", "update"}
+    for system in systems:
+        if system.climates or system.config[CONF_THERMOSTATS]:
+            platforms.add("climate")
+        if system.hotwaters:
+            platforms.add("water_heater")
+        if system.ventilations:
+            platforms.add("fan")
+        if system.config[CONF_BINARY_SENSORS]:
+            platforms.add("binary_sensor")
+    return [platform for platform in FORWARD_PLATFORMS if platform in platforms]
+
+
 @dataclass
 class NibeData:
     """Holder for nibe data."""
@@ -138,16 +266,39 @@ class NibeData:
     session: UplinkSession
     uplink: Uplink
     systems: dict[int, NibeSystem]
+    topology: NibeTopology
     coordinator: DataUpdateCoordinator | None = None
+    platforms: list[str] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @contextmanager
+    def timed(self, phase: str) -> Iterator[None]:
+        """Record the time spent in a setup phase."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.timings[phase] = elapsed = round(time.monotonic() - start, 3)
+            _LOGGER.debug("Setup phase %s took %.3f s", phase, elapsed)
 
 
 async def async_setup(hass, config):
     """Configure the nibe uplink component."""
     hass.data[DATA_NIBE_ENTRIES] = {}
+    hass.data[DATA_NIBE_BUDGETS] = {}
     if DOMAIN in config:
         hass.data[DATA_NIBE_CONFIG] = config[DOMAIN]
     else:
         hass.data[DATA_NIBE_CONFIG] = NIBE_SCHEMA({})
+    hass.data[DATA_NIBE_TOPOLOGY] = topology = NibeTopology(hass)
+    await topology.async_load()
+    hass.data[DATA_NIBE_PARAMETERS] = parameter_cache = NibeParameterCache(hass)
+    await parameter_cache.async_load()
+    hass.data[DATA_NIBE_SYSTEMS] = systems_cache = NibeSystemsCache(hass)
+    await systems_cache.async_load()
+    from .services import async_register_services
+
     await async_register_services(hass)
     return True
 
@@ -160,12 +311,17 @@ def _get_system_config(hass, system_id: int):
     return SYSTEM_SCHEMA({})
 
 
-class NibeSystemsCoordinator(DataUpdateCoordinator[dict[int, System]]):
+def _without_activity(system: System) -> dict[str, Any]:
+    return {key: value for key, value in system.items() if key != "lastActivityDate"}
+
+
+class NibeSystemsCoordinator(DataUpdateCoordinator[dict[int, "System"]]):
     """Coordinator that keeps track of all systems."""
 
-    def __init__(self, hass: HomeAssistant, uplink: Uplink):
+    def __init__(self, hass: HomeAssistant, uplink: Uplink, budget: RequestBudget):
         """Initialize systems coordinator."""
         self.uplink = uplink
+        self.budget = budget
         super().__init__(
             hass,
             _LOGGER,
@@ -176,13 +332,15 @@ class NibeSystemsCoordinator(DataUpdateCoordinator[dict[int, System]]):
     async def _async_update_data(self) -> dict[int, System]:
         """Update data via library."""
 
-        systems_raw = await self.uplink.get_systems()
+        systems_raw = await async_retry(self.uplink.get_systems)
         systems = {system["systemId"]: system for system in systems_raw}
         return systems
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: config_entries.ConfigEntry):
     """Set up an access point from a config entry."""
+    from nibeuplink import Uplink, UplinkSession
+
     _LOGGER.debug("Setup nibe entry")
 
     scope = None
@@ -204,43 +362,277 @@ async def async_setup_entry(hass: HomeAssistant, entry: config_entries.ConfigEnt
         access_data_write=access_data_write,
         scope=scope,
     )
-    await session.open()
+    # Entries using the same application share its request quota
+    budgets: dict[str, RequestBudget] = hass.data[DATA_NIBE_BUDGETS]
+    if (budget := budgets.get(entry.data[CONF_CLIENT_ID])) is None:
+        budget = budgets[entry.data[CONF_CLIENT_ID]] = RequestBudget()
+    budget.per_minute = hass.data[DATA_NIBE_CONFIG][CONF_REQUESTS_PER_MINUTE]
 
     uplink = Uplink(session)
-    coordinator = NibeSystemsCoordinator(hass, uplink)
+    uplink.throttle = AdaptiveThrottle(budget)
+    coordinator = NibeSystemsCoordinator(hass, uplink, budget)
 
-    data = NibeData(session, uplink, {}, coordinator)
+    data = NibeData(session, uplink, {}, hass.data[DATA_NIBE_TOPOLOGY], coordinator)
     hass.data[DATA_NIBE_ENTRIES][entry.entry_id] = data
 
-    await coordinator.async_config_entry_first_refresh()
+    systems_cache: NibeSystemsCache = hass.data[DATA_NIBE_SYSTEMS]
+    background = False
+    if entry.options.get(CONF_BACKGROUND_SETUP) and (
+        systems_cached := systems_cache.get(entry.entry_id)
+    ):
+        cached = {system["systemId"]: system for system in systems_cached}
+        # Discovery can't wait for the session, so all of it must be cached
+        if all(
+            data.topology.is_complete(system_id, TOPOLOGY_KEYS)
+            for system_id in _get_enabled_systems(entry, cached)
+        ):
+            _LOGGER.debug("Setting up from cached systems, continuing in background")
+            background = True
+            coordinator.async_set_updated_data(cached)
+        else:
+            _LOGGER.debug("Topology of systems not cached, setting up in foreground")
+
+    if not background:
+        with data.timed("session_open"):
+            await session.open()
+        with data.timed("systems_refresh"):
+            await coordinator.async_config_entry_first_refresh()
+
+    systems = [
+        _create_system(hass, entry, data, system_id)
+        for system_id in _get_enabled_systems(entry, coordinator.data)
+    ]
+    restored = [system for system in systems if system.restored]
+
+    async def _setup_system(system: NibeSystem):
+        if not background:
+            with data.timed(f"system.{system.system_id}.refresh"):
+                await system.async_config_entry_first_refresh()
+            system.ready.set()
+        # With background setup, discovery is served from cache and
+        # revalidated once the system is ready
+        with data.timed(f"system.{system.system_id}.discover"):
+            await system.async_discover(data.topology)
+
+    with data.timed("systems_setup"):
+        await gather_limited(
+            SETUP_CONCURRENCY, *[_setup_system(system) for system in systems]
+        )
+    for system in systems:
+        data.systems[system.system_id] = system
+
+    async def _forward_platform(platform: str):
+        with data.timed(f"platform.{platform}"):
+            await hass.config_entries.async_forward_entry_setups(entry, [platform])
 
-    if systems_conf := entry.options.get(CONF_SYSTEMS):
-        systems_enabled = {system_id for system_id in systems_conf}
-    else:
-        systems_enabled = set(coordinator.data.keys())
+    # Platforms without any entities are not loaded at all
+    data.platforms = _get_platforms(systems)
+    with data.timed("platforms_setup"):
+        await asyncio.gather(
+            *[_forward_platform(platform) for platform in data.platforms]
+        )
+    for system in systems:
+        system.async_evict_unreferenced()
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
-    for system_id, system_raw in coordinator.data.items():
-        if system_id not in systems_enabled:
-            continue
+    if background:
+        entry.async_create_background_task(
+            hass, _async_setup_background(hass, entry, data), "Nibe setup"
+        )
+        return True
+
+    systems_cache.set(entry.entry_id, list(coordinator.data.values()))
 
-        system = NibeSystem(
-            hass, system_raw, _get_system_config(hass, system_id), coordinator
+    # Entities started out from restored values, get them up to date
+    for system in restored:
+        entry.async_create_background_task(
+            hass, system.async_request_refresh(), f"Nibe refresh {system.system_id}"
         )
-        await system.async_config_entry_first_refresh()
+
+    return True
+
+
+def _config_items(value: dict | list) -> dict:
+    """Return configuration items by identifier."""
+    if isinstance(value, dict):
+        return value
+    return dict.fromkeys(value)
+
+
+def _get_enabled_systems(
+    entry: config_entries.ConfigEntry, systems: dict[int, System]
+) -> list[int]:
+    """Return the available systems enabled by the entry options."""
+    if systems_conf := entry.options.get(CONF_SYSTEMS):
+        return [system_id for system_id in systems if system_id in systems_conf]
+    return list(systems)
+
+
+def _create_system(
+    hass: HomeAssistant,
+    entry: config_entries.ConfigEntry,
+    data: NibeData,
+    system_id: int,
+) -> NibeSystem:
+    """Create a system, restoring its last known parameter values."""
+    system = NibeSystem(
+        hass,
+        data.coordinator.data[system_id],
+        _get_system_config(hass, system_id),
+        data.coordinator,
+    )
+    parameter_cache: NibeParameterCache = hass.data[DATA_NIBE_PARAMETERS]
+    system.restored = parameter_cache.async_restore(system)
+    system.async_on_unload(parameter_cache.async_track(system))
+    return system
+
+
+async def _async_update_listener(
+    hass: HomeAssistant, entry: config_entries.ConfigEntry
+):
+    """Apply changed options by adding and unloading systems."""
+    data: NibeData = hass.data[DATA_NIBE_ENTRIES][entry.entry_id]
+    async with data.lock:
+        await _async_update_systems(hass, entry, data)
+
+
+async def _async_update_systems(
+    hass: HomeAssistant, entry: config_entries.ConfigEntry, data: NibeData
+):
+    """Add newly enabled systems and unload deselected ones."""
+    # Only drop systems deselected in options, not ones missing from a refresh
+    systems_conf = entry.options.get(CONF_SYSTEMS) or data.systems.keys()
+    for system_id in data.systems.keys() - set(systems_conf):
+        _LOGGER.debug("Unloading system %s", system_id)
+        system = data.systems.pop(system_id)
+        async_dispatcher_send(hass, SIGNAL_SYSTEM_UNLOADED.format(system_id))
+        await system.unload()
+        hass.data[DATA_NIBE_PARAMETERS].async_remove(system_id)
+        _async_remove_system_devices(hass, entry, system_id)
+
+    async def _setup_system(system: NibeSystem):
+        _LOGGER.debug("Adding system %s", system.system_id)
+        await system.async_refresh()
+        system.ready.set()
+        await system.async_discover(data.topology)
+
+    added = [
+        _create_system(hass, entry, data, system_id)
+        for system_id in _get_enabled_systems(entry, data.coordinator.data)
+        if system_id not in data.systems
+    ]
+    if not added:
+        return
+
+    await gather_limited(
+        SETUP_CONCURRENCY, *[_setup_system(system) for system in added]
+    )
+    for system in added:
         data.systems[system.system_id] = system
+        async_dispatcher_send(hass, SIGNAL_SYSTEM_ADDED.format(entry.entry_id), system)
+
+    await _async_forward_new_platforms(hass, entry, data)
+
+
+@callback
+def _async_remove_system_devices(
+    hass: HomeAssistant, entry: config_entries.ConfigEntry, system_id: int
+):
+    """Remove the devices of a system, along with their entities."""
+    reg = device_registry.async_get(hass)
+    for device in device_registry.async_entries_for_config_entry(reg, entry.entry_id):
+        if any(
+            identifier[0] == DOMAIN and identifier[1] == system_id
+            for identifier in device.identifiers
+        ):
+            reg.async_remove_device(device.id)
+
+
+async def _async_forward_new_platforms(
+    hass: HomeAssistant, entry: config_entries.ConfigEntry, data: NibeData
+):
+    """Forward platforms needed by the systems that are not loaded yet.
+
+    Loaded platforms add entities on signal, while newly forwarded
+    platforms set up all systems.
+    """
+    platforms = [
+        platform
+        for platform in _get_platforms(list(data.systems.values()))
+        if platform not in data.platforms
+    ]
+    if not platforms:
+        return
+    data.platforms.extend(platforms)
+    async with entry.setup_lock:
+        await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+
+async def async_reload_config(hass: HomeAssistant):
+    """Reload YAML configuration, updating entities created from it.
+
+    Entities are only added or removed for the configuration items that
+    changed, sessions and caches of the systems are kept.
+    """
+    config = await async_integration_yaml_config(hass, DOMAIN)
+    if config is None:
+        return
+    if DOMAIN in config:
+        hass.data[DATA_NIBE_CONFIG] = config[DOMAIN]
+    else:
+        hass.data[DATA_NIBE_CONFIG] = NIBE_SCHEMA({})
 
-    await hass.config_entries.async_forward_entry_setups(entry, FORWARD_PLATFORMS)
+    for entry_id, data in hass.data[DATA_NIBE_ENTRIES].items():
+        entry = hass.config_entries.async_get_entry(entry_id)
+        async with data.lock:
+            for system in data.systems.values():
+                system.async_update_config(_get_system_config(hass, system.system_id))
+            await _async_forward_new_platforms(hass, entry, data)
+
+
+async def _async_setup_background(
+    hass: HomeAssistant, entry: config_entries.ConfigEntry, data: NibeData
+):
+    """Finish setup of an entry started from cached data."""
+    try:
+        with data.timed("session_open"):
+            await data.session.open()
+    except Exception:
+        _LOGGER.exception("Failed to open session, retrying setup later")
+        await data.session.close()
+        await asyncio.sleep(SCAN_INTERVAL)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
 
-    return True
+    with data.timed("systems_refresh"):
+        await data.coordinator.async_refresh()
+
+    async def _refresh_system(system: NibeSystem):
+        with data.timed(f"system.{system.system_id}.refresh"):
+            await system.async_refresh()
+        system.ready.set()
+
+    await gather_limited(
+        SETUP_CONCURRENCY,
+        *[_refresh_system(system) for system in data.systems.values()],
+    )
+
+    if data.coordinator.last_update_success:
+        hass.data[DATA_NIBE_SYSTEMS].set(
+            entry.entry_id, list(data.coordinator.data.values())
+        )
 
 
 async def async_unload_entry(hass: HomeAssistant, entry):
     """Unload a configuration entity."""
     data: NibeData = hass.data[DATA_NIBE_ENTRIES][entry.entry_id]
 
-    unload_ok = await hass.config_entries.async_unload_platforms(
-        entry, FORWARD_PLATFORMS
-    )
+    # Save parameters while entities still reference them
+    parameter_cache: NibeParameterCache = hass.data[DATA_NIBE_PARAMETERS]
+    for system in data.systems.values():
+        parameter_cache.async_save(system)
+
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, data.platforms)
     if unload_ok:
         await asyncio.gather(*[system.unload() for system in data.systems.values()])
 
@@ -266,22 +658,66 @@ class NibeSystem(DataUpdateCoordinator):
         self.system_id = system["systemId"]
         self.system = system
         self.uplink = parent.uplink
+        self.budget = parent.budget
         self.parent = parent
         self.notice: list[dict] = []
         self.statuses: set[str] = set()
         self.software: SystemSoftwareInfo | None = None
+        self.units: list[SystemUnit] | None = None
+        self.climates: list[ClimateSystem] = []
+        self.hotwaters: list[HotWaterSystem] = []
+        self.ventilations: list[VentilationSystem] = []
         self._unsub: list[Callable] = []
         self.config = config
         self._parameters: ParameterSet = {}
-        self._parameter_subscribers: dict[object, set[ParameterId]] = {}
+        self._parameters_fetched: dict[ParameterId, datetime] = {}
+        self._parameter_max_age: dict[str, timedelta] = {
+            str(parameter_id): rule[CONF_MAX_AGE]
+            for rule in config[CONF_PARAMETER_MAX_AGE]
+            for parameter_id in rule[CONF_PARAMETERS]
+        }
+        self._parameter_refs: dict[ParameterId, int] = {}
         self._parameter_preload: set[ParameterId] = set()
+        self._status_parameters: set[ParameterId] = set()
+        self._unit_parameters: dict[int, set[ParameterId]] = {}
+        self._parameter_listeners: dict[ParameterId, dict[object, CALLBACK_TYPE]] = {}
+        self._status_listeners: dict[object, CALLBACK_TYPE] = {}
+        self._changed: set[ParameterId] = set()
+        self._statuses_changed = False
+        self._dispatched_state = (True, False)
+        self._slow_interval: timedelta = config[CONF_SLOW_UPDATE_INTERVAL]
+        self._slow_updated: datetime | None = None
+        self._load_pending: set[ParameterId] = set()
+        self._load_task: asyncio.Task | None = None
+        self._parameter_flights: dict[ParameterId, asyncio.Task] = {}
+        self._interval: timedelta = config[CONF_UPDATE_INTERVAL]
+        self._slices: int = config[CONF_PARAMETER_SLICES]
+        self._slice: int | None = None
+        self._activity: datetime | None = None
+        self._activity_updated: datetime | None = None
+        self._parameters_refreshed: datetime | None = None
+        self.activity_cadence: timedelta | None = None
+        self.offline = False
+        self._status_offline = False
+        self._offline_activity: datetime | None = None
+        self._track_activity(system)
+        self._track_connection(system)
+        self.ready = asyncio.Event()
+        self.restored = False
+        self._reads: set[asyncio.Task] = set()
+        self._writes: set[asyncio.Task] = set()
+        self._unloading = False
+        self.circuit = CircuitBreaker(f"system {self.system_id}")
+        self.stale = False
 
         super().__init__(
             hass,
             _LOGGER,
             name=f"Nibe Uplink: {self.system_id}",
-            update_interval=timedelta(minutes=10),
+            update_interval=config[CONF_UPDATE_INTERVAL],
         )
+        # Systems can be added after setup, outside the config entry context
+        self.config_entry = parent.config_entry
 
         reg = device_registry.async_get(self.hass)
         reg.async_get_or_create(
@@ -294,56 +730,453 @@ class NibeSystem(DataUpdateCoordinator):
         )
 
         self._unsub.append(parent.async_add_listener(self._async_check_refresh))
+        self._unsub.append(self.async_add_listener(self._async_dispatch_parameters))
 
     async def unload(self):
-        """Unload system."""
+        """Unload system.
+
+        Reads in flight are cancelled, while writes are given until the
+        unload timeout to complete before they are cancelled as well.
+        """
+        self._unloading = True
         for unsub in reversed(self._unsub):
             unsub()
         self._unsub = []
 
+        for task in self._reads:
+            task.cancel()
+
+        if self._writes:
+            timeout: timedelta = self.hass.data[DATA_NIBE_CONFIG][CONF_UNLOAD_TIMEOUT]
+            _, pending = await asyncio.wait(
+                self._writes, timeout=timeout.total_seconds()
+            )
+            for task in pending:
+                _LOGGER.warning(
+                    "Dropping %s on system %s, not completed within %s",
+                    task.get_name(),
+                    self.system_id,
+                    timeout,
+                )
+                task.cancel()
+
+        if tasks := self._reads | self._writes:
+            await asyncio.wait(tasks)
+
+    def _async_create_task(
+        self, tasks: set[asyncio.Task], target: Coroutine[Any, Any, _T], name: str
+    ) -> asyncio.Task[_T]:
+        """Create a task owned by the system."""
+        if self._unloading:
+            target.close()
+            raise HomeAssistantError(f"System {self.system_id} is unloading")
+        task = self.hass.async_create_task(target, name)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        return task
+
+    @callback
+    def async_create_read_task(
+        self, target: Coroutine[Any, Any, _T], name: str
+    ) -> asyncio.Task[_T]:
+        """Create a read task, cancelled when the system is unloaded."""
+        return self._async_create_task(self._reads, target, name)
+
+    @callback
+    def async_create_write_task(
+        self, target: Coroutine[Any, Any, _T], name: str
+    ) -> asyncio.Task[_T]:
+        """Create a write task, allowed to complete when the system is unloaded."""
+        return self._async_create_task(self._writes, target, name)
+
+    async def put_parameter(self, parameter_id: ParameterId, value: Any) -> str:
+        """Set a parameter on the system."""
+        result = await self.async_create_write_task(
+            self.uplink.put_parameter(self.system_id, parameter_id, value),
+            f"Nibe put parameter {parameter_id}",
+        )
+        # Make sure the next read is not served from cache
+        self._parameters_fetched.pop(parameter_id, None)
+        return result
+
+    @callback
+    def async_update_config(self, config: dict):
+        """Update the configuration items that entities are created from.
+
+        Platforms are signaled with the items added and removed for each
+        key, items that changed are both removed and added again. Other
+        configuration is only applied when the entry is set up again.
+        """
+        if changed := [
+            key
+            for key in config
+            if key not in CONFIG_ENTITY_KEYS and config[key] != self.config.get(key)
+        ]:
+            _LOGGER.warning(
+                "Changes to %s of system %s are applied after a restart",
+                ", ".join(changed),
+                self.system_id,
+            )
+        for key in CONFIG_ENTITY_KEYS:
+            old = _config_items(self.config[key])
+            new = _config_items(config[key])
+            removed = [
+                item for item in old if item not in new or old[item] != new[item]
+            ]
+            added = [item for item in new if item not in old or old[item] != new[item]]
+            self.config = {**self.config, key: config[key]}
+            if added or removed:
+                _LOGGER.debug(
+                    "Config %s of system %s changed, added %s removed %s",
+                    key,
+                    self.system_id,
+                    added,
+                    removed,
+                )
+                async_dispatcher_send(
+                    self.hass,
+                    SIGNAL_CONFIG_UPDATED.format(self.config_entry.entry_id),
+                    self,
+                    key,
+                    added,
+                    removed,
+                )
+
+    @callback
+    def async_on_unload(self, func: Callable[[], None]) -> None:
+        """Add a function to call when system is unloaded."""
+        self._unsub.append(func)
+
     @callback
     def _async_check_refresh(self):
-        """Update the system if timestamps have changed."""
+        """Update the system if it changed.
+
+        The last activity changes on almost every poll, so new activity
+        alone is left to the refresh of the next slot. Unless refreshing on
+        activity, or the system is back online after being offline.
+        """
         if system := self.parent.data.get(self.system_id):
             if self.system != system:
+                changed = _without_activity(system) != _without_activity(self.system)
+                offline = self.offline
                 self.system = system
-                self.config_entry.async_create_task(
-                    self.hass, self.async_request_refresh()
-                )
+                self._track_activity(system)
+                self._track_connection(system)
+                if (
+                    changed
+                    or (offline and not self.offline)
+                    or (
+                        self.config[CONF_REFRESH_ON_ACTIVITY]
+                        and self._has_new_activity()
+                    )
+                ):
+                    self.config_entry.async_create_task(
+                        self.hass, self.async_request_refresh()
+                    )
+                else:
+                    # Only entities showing the system itself need an update
+                    self.async_update_listeners()
 
     async def _async_update_data(self) -> None:
         """Update data via library."""
-        await self.update_notifications()
-        await self.update_statuses()
-        await self.update_version()
-
-        parameters = set()
-        for subscriber_parameters in self._parameter_subscribers.values():
-            parameters |= subscriber_parameters
-        parameters -= self._parameter_preload
+        try:
+            await self._async_update_or_serve_cached()
+        finally:
+            self._schedule_slot()
+
+    async def _async_update_or_serve_cached(self) -> None:
+        """Update data, or keep serving cached values marked as stale.
+
+        Once values are cached, failed updates keep serving them, and
+        updates are skipped altogether while the system is offline or the
+        circuit is open.
+        """
+        if self.offline and self._parameters_fetched:
+            _LOGGER.debug("System %s is offline, skipping update", self.system_id)
+            self.stale = True
+            return
+
+        if not self.circuit.allow():
+            _LOGGER.debug("Circuit open for system %s, skipping update", self.system_id)
+            self.stale = True
+            return
+
+        try:
+            complete = await self.async_create_read_task(
+                self._async_update(), f"Nibe update {self.system_id}"
+            )
+        except Exception as exc:
+            self.circuit.failure()
+            if not self._parameters_fetched:
+                raise
+            _LOGGER.warning(
+                "Failed to update system %s, serving cached values: %s",
+                self.system_id,
+                exc,
+            )
+            self.stale = True
+            return
+
+        self.circuit.success()
+        self.stale = not complete
+
+    def _schedule_slot(self) -> None:
+        """Align the next refresh with the next time slot of this system.
+
+        The update interval is divided into one slot per parameter slice,
+        and each system is offset into its slots by a hash of its identifier.
+        This spreads the refreshes of systems evenly, the same way on every
+        restart.
+        """
+        length = self._interval.total_seconds() / self._slices
+        offset = zlib.crc32(str(self.system_id).encode()) / 2**32 * length
+        now = time.time()
+        slot = math.floor((now - offset) / length) + 1
+        if self._slices > 1:
+            self._slice = slot % self._slices
+        self.update_interval = timedelta(seconds=offset + slot * length - now)
+
+    def _parameter_slice(self, parameter_id: ParameterId) -> int:
+        return zlib.crc32(str(parameter_id).encode()) % self._slices
+
+    def _track_activity(self, system: System) -> None:
+        """Learn the upload cadence of the system from its last activity."""
+        if not (value := system.get("lastActivityDate")):
+            return
+        activity = dt_util.parse_datetime(value)
+        if activity is None or (self._activity and activity <= self._activity):
+            return
+        if self._activity is not None:
+            interval = activity - self._activity
+            if self.activity_cadence is None:
+                self.activity_cadence = interval
+            else:
+                self.activity_cadence = (
+                    self.activity_cadence * (1 - ACTIVITY_CADENCE_WEIGHT)
+                    + interval * ACTIVITY_CADENCE_WEIGHT
+                )
+        self._activity = activity
+
+    def _track_connection(self, system: System) -> None:
+        """Track if the system is offline.
+
+        A system reported as offline is considered back online as soon as
+        it uploads new data, even if its connection status lags behind.
+        """
+        status_offline = (
+            str(system.get("connectionStatus", "")).upper() == CONNECTION_OFFLINE
+        )
+        if status_offline and not self._status_offline:
+            self._offline_activity = self._activity
+        self._status_offline = status_offline
+
+        offline = status_offline and self._activity == self._offline_activity
+        if offline != self.offline:
+            if offline:
+                _LOGGER.info("System %s is offline, pausing updates", self.system_id)
+            else:
+                _LOGGER.info("System %s is online, resuming updates", self.system_id)
+        self.offline = offline
+
+    def _has_new_activity(self) -> bool:
+        """Return if the system uploaded data since parameters were updated."""
+        return self._activity is not None and self._activity != self._activity_updated
+
+    def _expects_activity(self, now: datetime) -> bool:
+        """Return if refreshes can wait for the system to upload new data.
+
+        Regular refreshes are kept while the upload cadence is unknown,
+        when the system has not uploaded anything for several cadences, or
+        when all parameters were last refreshed more than an interval ago.
+        """
+        if self.activity_cadence is None or self._parameters_refreshed is None:
+            return False
+        if now - self._parameters_refreshed >= self._interval:
+            return False
+        overdue = self.activity_cadence * ACTIVITY_OVERDUE_FACTOR
+        return now - self._activity <= overdue
+
+    async def _async_update(self) -> bool:
+        """Update statuses, parameters and slowly changing data.
+
+        With parameter slices, only the parameters of the current slice are
+        updated, and statuses only with the first slice. When refreshing on
+        activity, all of them are updated once the system has uploaded new
+        data, and none while new data is expected. All parameters are
+        updated on the first refresh.
+
+        Returns if all parameters were updated.
+        """
+        parameters = self._parameter_refs.keys() - self._parameter_preload
         self._parameter_preload = set()
+        current_slice = self._slice
+        activity = self._activity
+        now = dt_util.utcnow()
+        on_activity = (
+            self.config[CONF_REFRESH_ON_ACTIVITY] and self._slow_updated is not None
+        )
+        idle = False
+        if on_activity:
+            if self._has_new_activity():
+                current_slice = None
+            elif self._expects_activity(now):
+                _LOGGER.debug("No new activity on system %s", self.system_id)
+                idle = True
+                parameters = set()
+
+        if current_slice is not None:
+            parameters = {
+                parameter_id
+                for parameter_id in parameters
+                if self._parameter_slice(parameter_id) == current_slice
+            }
+
+        if self._parameter_max_age:
+            # Skip parameters that will still be within their max age
+            # by the time they are next refreshed.
+            horizon = now + self._interval
+            parameters = {
+                parameter_id
+                for parameter_id in parameters
+                if (expires := self.parameter_expires(parameter_id)) is None
+                or expires <= horizon
+            }
+
+        # Statuses are fetched in parallel with parameters, so rely on the
+        # parameters included in the previous status update to avoid
+        # requesting them twice.
+        parameters -= self._status_parameters
+
+        tasks = [self.update_subscribed(parameters)]
+        if current_slice in (None, 0) and not idle:
+            tasks.append(self.update_statuses())
+
+        slow = (
+            self._slow_updated is None
+            or now - self._slow_updated >= self._slow_interval
+        )
+        if slow:
+            tasks += [self.update_notifications(), self.update_version()]
+
+        results = await asyncio.gather(*tasks)
+
+        if slow:
+            self._slow_updated = now
+        if current_slice is None:
+            self._parameters_refreshed = now
+        self._activity_updated = activity
+        return results[0]
+
+    async def update_subscribed(self, parameters: set[ParameterId]) -> bool:
+        """Update subscribed parameters using configured refresh mode."""
+        if self.config[CONF_PARAMETER_REFRESH] == REFRESH_CATEGORY:
+            parameters = parameters - await self.update_categories(parameters)
+
+        return await self.update_parameters(parameters)
+
+    async def async_discover(self, topology: NibeTopology):
+        """Discover active climate, hot water and ventilation systems.
+
+        All probes run in one concurrent pass, letting the library batch
+        their parameter requests, and the results are shared by platforms.
+        """
+        from nibeuplink import (
+            PARAM_CLIMATE_SYSTEMS,
+            PARAM_HOTWATER_SYSTEMS,
+            PARAM_VENTILATION_SYSTEMS,
+            get_active_climate,
+            get_active_hotwater,
+            get_active_ventilations,
+        )
+
+        async def _discover(key: str, probe, lookup: dict[str, _T]) -> list[_T]:
+            async def _probe() -> list[str]:
+                return sorted(await probe(self.uplink, self.system_id))
+
+            keys = await topology.async_discover(self.config_entry, self, key, _probe)
+            return [lookup[key] for key in keys]
 
-        await self.update_parameters(parameters)
+        self.climates, self.hotwaters, self.ventilations = await asyncio.gather(
+            _discover("climates", get_active_climate, PARAM_CLIMATE_SYSTEMS),
+            _discover("hotwaters", get_active_hotwater, PARAM_HOTWATER_SYSTEMS),
+            _discover(
+                "ventilations", get_active_ventilations, PARAM_VENTILATION_SYSTEMS
+            ),
+        )
 
     async def update_version(self):
         """Update software version."""
-        self.software = await self.uplink.get_system_software(self.system_id)
+        self.software = await async_retry(
+            lambda: self.uplink.get_system_software(self.system_id)
+        )
         _LOGGER.debug("Version: %s", self.software)
 
+    async def update_units(self):
+        """Update unit list."""
+        self.units = await async_retry(lambda: self.uplink.get_units(self.system_id))
+        _LOGGER.debug("Units: %s", self.units)
+
+    async def update_categories(self, parameters: set[ParameterId]) -> set[ParameterId]:
+        """Update parameter cache from unit categories.
+
+        Only units known to hold any of the requested parameters are fetched,
+        returns the requested parameters that was covered by the categories.
+        """
+        if self.units is None:
+            await self.update_units()
+        assert self.units is not None
+
+        async def _get(unit_id: int):
+            known = self._unit_parameters.get(unit_id)
+            if known is not None and not (known & parameters):
+                return
+
+            categories = await async_retry(
+                lambda: self.uplink.get_categories(self.system_id, True, unit_id)
+            )
+            covered = set()
+            for category in categories:
+                for parameter in category["parameters"] or []:
+                    parameter_id = parameter["parameterId"]
+                    # Requested parameters may not be subscribed yet, when
+                    # loaded before their entities are added
+                    if (
+                        parameter_id in parameters
+                        or parameter_id in self._parameter_refs
+                    ):
+                        self._store_parameter(parameter_id, parameter)
+                    covered.add(parameter_id)
+            self._unit_parameters[unit_id] = covered
+
+        await asyncio.gather(*[_get(unit["systemUnitId"]) for unit in self.units])
+
+        covered = set()
+        for unit_parameters in self._unit_parameters.values():
+            covered |= unit_parameters
+        return parameters & covered
+
     async def update_statuses(self):
         """Update status list."""
-        status_icons = await self.uplink.get_status(self.system_id)
+        status_icons = await async_retry(lambda: self.uplink.get_status(self.system_id))
         statuses = set()
+        status_parameters = set()
         for status_icon in status_icons:
             statuses.add(status_icon["title"])
             for parameter in status_icon["parameters"]:
-                self.set_parameter(parameter["parameterId"], parameter)
+                if parameter["parameterId"] in self._parameter_refs:
+                    self._store_parameter(parameter["parameterId"], parameter)
+                status_parameters.add(parameter["parameterId"])
+        if statuses != self.statuses:
+            self._statuses_changed = True
         self.statuses = statuses
+        self._status_parameters = status_parameters
         _LOGGER.debug("Statuses: %s", statuses)
 
     async def update_notifications(self):
         """Update notification list."""
-        notice = await self.uplink.get_notifications(self.system_id)
+        notice = await async_retry(
+            lambda: self.uplink.get_notifications(self.system_id)
+        )
         added = [k for k in notice if k not in self.notice]
         removed = [k for k in self.notice if k not in notice]
         self.notice = notice
@@ -363,40 +1196,253 @@ class NibeSystem(DataUpdateCoordinator):
     def get_parameter(
         self, parameter_id: ParameterId | None, cached=True
     ) -> ParameterType | None:
-        """Get a cached parameter."""
+        """Get a cached parameter.
+
+        With cached set to False, parameters past their max age are ignored.
+        """
+        if not cached and parameter_id is not None:
+            expires = self.parameter_expires(parameter_id)
+            if expires is not None and expires <= dt_util.utcnow():
+                return None
         return self._parameters.get(parameter_id)
 
-    async def update_parameters(self, parameters: set[ParameterId | None]):
-        """Update parameter cache."""
-
-        async def _get(parameter_id: ParameterId):
-            self._parameters[parameter_id] = await self.uplink.get_parameter(
-                self.system_id, parameter_id
+    def parameter_expires(self, parameter_id: ParameterId) -> datetime | None:
+        """Return when a cached parameter exceeds its max age, if known."""
+        max_age = self._parameter_max_age.get(str(parameter_id))
+        fetched = self._parameters_fetched.get(parameter_id)
+        if max_age is None or fetched is None:
+            return None
+        return fetched + max_age
+
+    def stored_parameters(self) -> list[tuple[ParameterId, ParameterType, datetime]]:
+        """Return subscribed parameters with the time they were fetched."""
+        return [
+            (parameter_id, self._parameters[parameter_id], fetched)
+            for parameter_id, fetched in self._parameters_fetched.items()
+            if parameter_id in self._parameter_refs
+            and self._parameters.get(parameter_id) is not None
+        ]
+
+    async def update_parameters(self, parameters: set[ParameterId | None]) -> bool:
+        """Update parameter cache, returns if all parameters were updated.
+
+        Failed parameters keep their cached value, the update only fails
+        if no parameter could be updated.
+        """
+
+        parameter_ids = [parameter_id for parameter_id in parameters if parameter_id]
+        if not parameter_ids:
+            return True
+
+        results = await asyncio.gather(
+            *[self.fetch_parameter(parameter_id) for parameter_id in parameter_ids],
+            return_exceptions=True,
+        )
+        failed = {
+            parameter_id: result
+            for parameter_id, result in zip(parameter_ids, results)
+            if isinstance(result, BaseException)
+        }
+        for result in failed.values():
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+        if len(failed) == len(parameter_ids):
+            raise next(iter(failed.values()))
+        if failed:
+            _LOGGER.warning(
+                "Failed to update parameters %s of system %s",
+                list(failed),
+                self.system_id,
             )
+        return not failed
+
+    async def fetch_parameter(
+        self, parameter_id: ParameterId, min_age: timedelta = PARAMETER_MIN_AGE
+    ) -> ParameterType | None:
+        """Fetch a parameter into cache, and return it.
+
+        Values fetched within min_age are returned from cache, and concurrent
+        callers for the same parameter share a single request.
+        """
+        fetched = self._parameters_fetched.get(parameter_id)
+        if fetched and dt_util.utcnow() - fetched < min_age:
+            return self._parameters.get(parameter_id)
+
+        if (task := self._parameter_flights.get(parameter_id)) is None:
 
-        tasks = [_get(parameter_id) for parameter_id in parameters if parameter_id]
-        if tasks:
-            await asyncio.gather(*tasks)
+            async def _fetch() -> ParameterType | None:
+                data = await async_retry(
+                    lambda: self.uplink.get_parameter(self.system_id, parameter_id)
+                )
+                if data is None and self._parameters.get(parameter_id) is not None:
+                    # When a batched request fails, only one of its callers
+                    # gets the error, the others get no value
+                    raise HomeAssistantError(
+                        f"No value for parameter {parameter_id} of system {self.system_id}"
+                    )
+                self._store_parameter(parameter_id, data)
+                return data
+
+            task = self.async_create_read_task(
+                _fetch(), f"Nibe get parameter {parameter_id}"
+            )
+            self._parameter_flights[parameter_id] = task
+            task.add_done_callback(
+                lambda _: self._parameter_flights.pop(parameter_id, None)
+            )
 
-    def set_parameter(self, parameter_id: ParameterId, data: ParameterType | None):
-        """Store a parameter in cache."""
+        # Cancelling one caller must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def async_load_parameters(self, parameters: set[ParameterId | None]):
+        """Load parameters not yet in cache.
+
+        Concurrent callers are coalesced into a single pass, so platforms
+        setting up in parallel share one fetch of their parameters.
+        """
+        if not self.ready.is_set():
+            # Subscribed parameters are fetched by the first refresh
+            return
+        self._load_pending |= {
+            parameter_id
+            for parameter_id in parameters
+            if parameter_id and parameter_id not in self._parameters_fetched
+        }
+        if self._load_task is None:
+            if not self._load_pending:
+                return
+            self._load_task = self.async_create_read_task(
+                self._async_load_pending(), f"Nibe load {self.system_id}"
+            )
+        await asyncio.shield(self._load_task)
+
+    async def _async_load_pending(self):
+        """Fetch parameters requested through async_load_parameters."""
+        try:
+            # Let other callers add their parameters before fetching
+            await asyncio.sleep(0)
+            while self._load_pending:
+                parameters, self._load_pending = self._load_pending, set()
+                await self.update_subscribed(parameters)
+        finally:
+            self._load_task = None
+
+    def set_parameter(
+        self,
+        parameter_id: ParameterId,
+        data: ParameterType | None,
+        fetched: datetime | None = None,
+    ):
+        """Store a parameter in cache.
+
+        Parameters fetched just now are skipped on the next refresh, while
+        parameters with an older fetched time are left to be refreshed. A
+        value older than the one already cached is ignored.
+        """
+        current = self._parameters_fetched.get(parameter_id)
+        if fetched and current and current > fetched:
+            return
+        self._store_parameter(parameter_id, data, fetched)
+        if fetched is None:
+            self._parameter_preload |= {parameter_id}
+
+    def _store_parameter(
+        self,
+        parameter_id: ParameterId,
+        data: ParameterType | None,
+        fetched: datetime | None = None,
+    ):
+        """Store a parameter in cache and track if it changed."""
+        if self._parameters.get(parameter_id) != data:
+            self._changed.add(parameter_id)
         self._parameters[parameter_id] = data
-        self._parameter_preload |= {parameter_id}
+        self._parameters_fetched[parameter_id] = fetched or dt_util.utcnow()
+
+    @callback
+    def async_evict_unreferenced(self, parameters: Iterable[ParameterId] | None = None):
+        """Evict cached parameters without subscribers.
+
+        Restored and preloaded values are cached before entities subscribe
+        to them, so this is called once entities have been added. One-off
+        reads evict just the parameters they read.
+        """
+        candidates = self._parameters.keys() if parameters is None else parameters
+        for parameter_id in set(candidates) - self._parameter_refs.keys():
+            self._parameters.pop(parameter_id, None)
+            self._parameters_fetched.pop(parameter_id, None)
+            self._parameter_preload.discard(parameter_id)
+            self._changed.discard(parameter_id)
+
+    def _unref_parameter(self, parameter_id: ParameterId):
+        """Drop a reference to a parameter, evicting it when unused."""
+        count = self._parameter_refs[parameter_id] - 1
+        if count:
+            self._parameter_refs[parameter_id] = count
+            return
+        del self._parameter_refs[parameter_id]
+        self._parameters.pop(parameter_id, None)
+        self._parameters_fetched.pop(parameter_id, None)
+        self._parameter_preload.discard(parameter_id)
+        self._changed.discard(parameter_id)
+
+    @callback
+    def _async_dispatch_parameters(self):
+        """Notify the parameter listeners affected by the last refresh."""
+        changed, self._changed = self._changed, set()
+        statuses_changed, self._statuses_changed = self._statuses_changed, False
+
+        listeners: dict[object, CALLBACK_TYPE] = {}
+        if (state := (self.last_update_success, self.stale)) != self._dispatched_state:
+            # Availability or staleness changed, so everybody need to know
+            self._dispatched_state = state
+            for parameter_listeners in self._parameter_listeners.values():
+                listeners.update(parameter_listeners)
+            listeners.update(self._status_listeners)
+        else:
+            for parameter_id in changed:
+                listeners.update(self._parameter_listeners.get(parameter_id, {}))
+            if statuses_changed:
+                listeners.update(self._status_listeners)
+
+        for update_callback in listeners.values():
+            update_callback()
 
     def add_parameter_subscriber(
-        self, parameters: set[ParameterId | None]
+        self,
+        parameters: set[ParameterId | None],
+        update_callback: CALLBACK_TYPE | None = None,
+        statuses: bool = False,
     ) -> CALLBACK_TYPE:
-        """Add a subscriber for parameters."""
+        """Add a subscriber for parameters.
+
+        The optional update_callback is called after a refresh when any of
+        the parameters changed, or when the statuses changed if requested.
+        """
         sentinel = object()
+        parameters_clean = cast("set[ParameterId]", (parameters - {None}))
 
         @callback
         def _remove():
-            del self._parameter_subscribers[sentinel]
-
-        parameters_clean = cast(set[ParameterId], (parameters - {None}))
-
-        self._parameter_subscribers[sentinel] = parameters_clean
-        for parameter in parameters_clean - set(self._parameters.keys()):
-            self._parameters[parameter] = None
+            for parameter in parameters_clean:
+                self._unref_parameter(parameter)
+            if update_callback is None:
+                return
+            for parameter in parameters_clean:
+                listeners = self._parameter_listeners[parameter]
+                del listeners[sentinel]
+                if not listeners:
+                    del self._parameter_listeners[parameter]
+            self._status_listeners.pop(sentinel, None)
+
+        for parameter in parameters_clean:
+            self._parameter_refs[parameter] = self._parameter_refs.get(parameter, 0) + 1
+
+        if update_callback:
+            for parameter in parameters_clean:
+                self._parameter_listeners.setdefault(parameter, {})[
+                    sentinel
+                ] = update_callback
+            if statuses:
+                self._status_listeners[sentinel] = update_callback
 
         return _remove
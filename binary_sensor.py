@@ -2,15 +2,23 @@
 from __future__ import annotations
 
 import logging
+from typing import TYPE_CHECKING
 
 from homeassistant.components.binary_sensor import ENTITY_ID_FORMAT, BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from nibeuplink.typing import ParameterId
 
-from . import NibeData, NibeSystem
-from .const import CONF_BINARY_SENSORS, DATA_NIBE_ENTRIES
-from .entity import NibeParameterEntity
+from . import NibeSystem
+from .const import CONF_BINARY_SENSORS
+from .entity import (
+    NibeParameterEntity,
+    async_load_entities,
+    async_remove_configured,
+    async_setup_systems,
+)
+
+if TYPE_CHECKING:
+    from nibeuplink.typing import ParameterId
 
 PARALLEL_UPDATES = 0
 _LOGGER = logging.getLogger(__name__)
@@ -20,14 +28,33 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
 ):
     """Set up the device based on a config entry."""
-    data: NibeData = hass.data[DATA_NIBE_ENTRIES][entry.entry_id]
+    configured: dict[tuple[int, ParameterId], NibeBinarySensor] = {}
+
+    def create(system: NibeSystem, parameter_ids: list[ParameterId]):
+        entities = []
+        for parameter_id in parameter_ids:
+            entity = NibeBinarySensor(system, parameter_id)
+            configured[(system.system_id, parameter_id)] = entity
+            entities.append(entity)
+        return entities
+
+    async def add_systems(systems: list[NibeSystem]):
+        entities = []
+        for system in systems:
+            entities.extend(create(system, system.config[CONF_BINARY_SENSORS]))
+
+        await async_load_entities(entities)
+        async_add_entities(entities)
 
-    entities = []
-    for system in data.systems.values():
-        for parameter_id in system.config[CONF_BINARY_SENSORS]:
-            entities.append(NibeBinarySensor(system, parameter_id))
+    async def update_config(system: NibeSystem, key: str, added: list, removed: list):
+        if key != CONF_BINARY_SENSORS:
+            return
+        await async_remove_configured(configured, system.system_id, removed)
+        entities = create(system, added)
+        await async_load_entities(entities)
+        async_add_entities(entities)
 
-    async_add_entities(entities, True)
+    await async_setup_systems(hass, entry, add_systems, update_config)
 
 
 class NibeBinarySensor(NibeParameterEntity, BinarySensorEntity):
@@ -1,11 +1,10 @@
 """Climate entities for nibe uplink."""
 from __future__ import annotations
 
-import asyncio
 import logging
 from collections import OrderedDict
 from datetime import timedelta
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
 from homeassistant.components.climate import (
     ENTITY_ID_FORMAT,
@@ -38,15 +37,9 @@ from homeassistant.helpers.event import (
     async_track_time_interval,
 )
 from homeassistant.helpers.restore_state import RestoreEntity
-from nibeuplink import (
-    PARAM_PUMP_SPEED_HEATING_MEDIUM,
-    ClimateSystem,
-    SetThermostatModel,
-    get_active_climate,
-)
-from nibeuplink.typing import ParameterId
+from nibeuplink import PARAM_PUMP_SPEED_HEATING_MEDIUM
 
-from . import NibeData, NibeSystem
+from . import NibeSystem
 from .const import (
     ATTR_TARGET_TEMPERATURE,
     ATTR_VALVE_POSITION,
@@ -54,11 +47,20 @@ from .const import (
     CONF_CURRENT_TEMPERATURE,
     CONF_THERMOSTATS,
     CONF_VALVE_POSITION,
-    DATA_NIBE_ENTRIES,
     DEFAULT_THERMOSTAT_TEMPERATURE,
 )
 from .const import DOMAIN as DOMAIN_NIBE
-from .entity import NibeEntity
+from .entity import (
+    NibeEntity,
+    async_load_entities,
+    async_remove_configured,
+    async_remove_with_system,
+    async_setup_systems,
+)
+
+if TYPE_CHECKING:
+    from nibeuplink import ClimateSystem, SetThermostatModel
+    from nibeuplink.typing import ParameterId
 
 PARALLEL_UPDATES = 0
 _LOGGER = logging.getLogger(__name__)
@@ -68,40 +70,53 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
 ):
     """Set up the climate device based on a config entry."""
-    data: NibeData = hass.data[DATA_NIBE_ENTRIES][entry.entry_id]
-    uplink = data.uplink
-    systems = data.systems
-
-    entities = []
+    configured: dict[tuple[int, int], NibeThermostat] = {}
 
-    async def add_active(system: NibeSystem):
-        climates = await get_active_climate(uplink, system.system_id)
-        for climate in climates.values():
-            entities.append(NibeClimateSupply(system, climate))
-            entities.append(NibeClimateRoom(system, climate))
-
-    for system in systems.values():
+    def create(system: NibeSystem, thermostat_ids: list[int]):
+        entities = []
         thermostats = system.config[CONF_THERMOSTATS]
-        for thermostat_id, thermostat_config in thermostats.items():
-            entities.append(
-                NibeThermostat(
-                    system,
-                    thermostat_id,
-                    thermostat_config.get(CONF_NAME),
-                    thermostat_config.get(CONF_CURRENT_TEMPERATURE),
-                    thermostat_config.get(CONF_VALVE_POSITION),
-                    thermostat_config.get(CONF_CLIMATE_SYSTEMS),
-                )
+        for thermostat_id in thermostat_ids:
+            thermostat_config = thermostats[thermostat_id]
+            entity = NibeThermostat(
+                system,
+                thermostat_id,
+                thermostat_config.get(CONF_NAME),
+                thermostat_config.get(CONF_CURRENT_TEMPERATURE),
+                thermostat_config.get(CONF_VALVE_POSITION),
+                thermostat_config.get(CONF_CLIMATE_SYSTEMS),
             )
+            configured[(system.system_id, thermostat_id)] = entity
+            entities.append(entity)
+        return entities
 
-    await asyncio.gather(*[add_active(system) for system in systems.values()])
+    async def add_systems(systems: list[NibeSystem]):
+        entities = []
 
-    async_add_entities(entities, True)
+        for system in systems:
+            for climate in system.climates:
+                entities.append(NibeClimateSupply(system, climate))
+                entities.append(NibeClimateRoom(system, climate))
+
+        for system in systems:
+            entities.extend(create(system, list(system.config[CONF_THERMOSTATS])))
+
+        await async_load_entities(entities)
+        async_add_entities(entities)
+
+    async def update_config(system: NibeSystem, key: str, added: list, removed: list):
+        if key != CONF_THERMOSTATS:
+            return
+        await async_remove_configured(configured, system.system_id, removed)
+        async_add_entities(create(system, added))
+
+    await async_setup_systems(hass, entry, add_systems, update_config)
 
 
 class NibeClimate(NibeEntity, ClimateEntity):
     """Base class for nibe climate entities."""
 
+    _uses_statuses = True
+
     def __init__(
         self,
         system: NibeSystem,
@@ -135,6 +150,7 @@ class NibeClimate(NibeEntity, ClimateEntity):
         data["pump_speed_heating_medium"] = self.get_float(
             PARAM_PUMP_SPEED_HEATING_MEDIUM
         )
+        data["stale"] = self._system.stale
 
         return data
 
@@ -152,9 +168,7 @@ class NibeClimate(NibeEntity, ClimateEntity):
         _LOGGER.debug(f"Set temperature on parameter {parameter} to {data}")
 
         try:
-            self._status = await self._uplink.put_parameter(
-                self._system_id, parameter, data
-            )
+            self._status = await self._system.put_parameter(parameter, data)
         except BaseException:
             self._status = "ERROR"
             raise
@@ -393,6 +407,7 @@ class NibeThermostat(ClimateEntity, RestoreEntity):
     ):
         """Init."""
         self._attr_name = name
+        self._system = system
         self._uplink = system.uplink
         self._system_id = system.system_id
         self._external_id = external_id
@@ -423,6 +438,7 @@ class NibeThermostat(ClimateEntity, RestoreEntity):
     async def async_added_to_hass(self):
         """Run when entity about to be added."""
         await super().async_added_to_hass()
+        async_remove_with_system(self, self._system_id)
         # Check If we have an old state
         old_state = await self.async_get_last_state()
         if old_state is not None:
@@ -455,7 +471,7 @@ class NibeThermostat(ClimateEntity, RestoreEntity):
 
         self.async_on_remove(
             async_track_time_interval(
-                self.hass, self._async_publish, timedelta(minutes=15)
+                self.hass, self._async_publish_later, timedelta(minutes=15)
             )
         )
 
@@ -521,11 +537,17 @@ class NibeThermostat(ClimateEntity, RestoreEntity):
         self._target_temperature = temperature
         self._async_publish_update()
 
+    @callback
+    def _async_publish_later(self, now=None):
+        self._system.async_create_write_task(
+            self._async_publish(), f"Publish thermostat {self._external_id}"
+        )
+
     def _async_publish_update(self):
-        self.hass.async_create_task(self._async_publish(), "Publish thermostat")
+        self._async_publish_later()
         self.async_write_ha_state()
 
-    async def _async_publish(self, time=None):
+    async def _async_publish(self):
         def scaled(value, multi=10):
             if value is None:
                 return None
@@ -10,13 +10,13 @@ from homeassistant import config_entries, data_entry_flow
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.core import callback
 from homeassistant.helpers import network
-from nibeuplink import Uplink, UplinkSession
 
 from . import NibeData
 from .const import (
     AUTH_CALLBACK_NAME,
     AUTH_CALLBACK_URL,
     CONF_ACCESS_DATA,
+    CONF_BACKGROUND_SETUP,
     CONF_CLIENT_ID,
     CONF_CLIENT_SECRET,
     CONF_REDIRECT_URI,
@@ -52,6 +52,8 @@ class NibeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(self, user_input=None):
         """Handle a flow initialized by the user."""
         if user_input:
+            from nibeuplink import Uplink, UplinkSession
+
             scope = None
             if user_input[CONF_WRITEACCESS]:
                 scope = ["READSYSTEM", "WRITESYSTEM"]
@@ -152,7 +154,8 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             return self.async_create_entry(title="", data=user_input)
 
         data: NibeData = self.hass.data[DATA_NIBE_ENTRIES][self._entry.entry_id]
-        systems = await data.uplink.get_systems()
+        # The session may still be opening for entries set up in background
+        systems = data.coordinator.data.values()
 
         systems_dict = {
             str(system["systemId"]): f"{system['name']} : {system['systemId']}"
@@ -170,7 +173,11 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 {
                     vol.Required(CONF_SYSTEMS, default=system_sel): cv.multi_select(
                         systems_dict
-                    )
+                    ),
+                    vol.Optional(
+                        CONF_BACKGROUND_SETUP,
+                        default=self._entry.options.get(CONF_BACKGROUND_SETUP, False),
+                    ): bool,
                 }
             ),
         )
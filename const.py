@@ -1,4 +1,5 @@
 """Constants for nibe uplink."""
+from datetime import timedelta
 
 ATTR_TARGET_TEMPERATURE = "target_temperature"
 ATTR_VALVE_POSITION = "valve_position"
@@ -6,6 +7,10 @@ ATTR_VALVE_POSITION = "valve_position"
 DOMAIN = "nibe"
 DATA_NIBE_ENTRIES = "nibe.entries"
 DATA_NIBE_CONFIG = "nibe.config"
+DATA_NIBE_TOPOLOGY = "nibe.topology"
+DATA_NIBE_PARAMETERS = "nibe.parameters"
+DATA_NIBE_SYSTEMS = "nibe.systems"
+DATA_NIBE_BUDGETS = "nibe.budgets"
 
 CONF_CLIENT_ID = "client_id"
 CONF_CLIENT_SECRET = "client_secret"
@@ -26,6 +31,20 @@ CONF_CURRENT_TEMPERATURE = "current_temperature"
 CONF_VALVE_POSITION = "valve_position"
 CONF_CLIMATE_SYSTEMS = "systems"
 CONF_FANS = "fans"
+CONF_PARAMETER_REFRESH = "parameter_refresh"
+CONF_UPDATE_INTERVAL = "update_interval"
+CONF_SLOW_UPDATE_INTERVAL = "slow_update_interval"
+CONF_PARAMETER_MAX_AGE = "parameter_max_age"
+CONF_PARAMETER_SLICES = "parameter_slices"
+CONF_REFRESH_ON_ACTIVITY = "refresh_on_activity"
+CONF_PARAMETERS = "parameters"
+CONF_MAX_AGE = "max_age"
+CONF_BACKGROUND_SETUP = "background_setup"
+CONF_UNLOAD_TIMEOUT = "unload_timeout"
+CONF_REQUESTS_PER_MINUTE = "requests_per_minute"
+
+REFRESH_PARAMETER = "parameter"
+REFRESH_CATEGORY = "category"
 
 AUTH_CALLBACK_URL = "/api/nibe/auth"
 AUTH_CALLBACK_NAME = "api:nibe:auth"
@@ -36,9 +55,21 @@ SERVICE_SET_SMARTHOME_MODE = "set_smarthome_mode"
 SERVICE_SET_PARAMETER = "set_parameter"
 SERVICE_GET_PARAMETER = "get_parameter"
 SERVICE_SET_THERMOSTAT = "set_thermostat"
+SERVICE_RELOAD = "reload"
 
 SIGNAL_STATUSES_UPDATED = "nibe.statuses_updated"
+SIGNAL_SYSTEM_ADDED = "nibe.system_added.{}"
+SIGNAL_SYSTEM_UNLOADED = "nibe.system_unloaded.{}"
+SIGNAL_CONFIG_UPDATED = "nibe.config_updated.{}"
 
 SCAN_INTERVAL = 30
+DEFAULT_UPDATE_INTERVAL = timedelta(minutes=10)
+SETUP_CONCURRENCY = 4
+TOPOLOGY_KEYS = ("climates", "hotwaters", "ventilations", "categories")
+DEFAULT_UNLOAD_TIMEOUT = timedelta(seconds=10)
+PARAMETER_MIN_AGE = timedelta(seconds=10)
+ACTIVITY_CADENCE_WEIGHT = 0.3
+ACTIVITY_OVERDUE_FACTOR = 3
+CONNECTION_OFFLINE = "OFFLINE"
 
 DEFAULT_THERMOSTAT_TEMPERATURE = 22
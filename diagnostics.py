@@ -0,0 +1,49 @@
+"""Diagnostics support for nibe uplink."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import NibeData
+from .const import CONF_ACCESS_DATA, CONF_CLIENT_SECRET, DATA_NIBE_ENTRIES
+
+TO_REDACT = {CONF_ACCESS_DATA, CONF_CLIENT_SECRET, "serialNumber", "address"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data: NibeData = hass.data[DATA_NIBE_ENTRIES][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "platforms": data.platforms,
+        "timings": data.timings,
+        "throttle": data.uplink.throttle.as_dict(),
+        "budget": data.coordinator.budget.as_dict(),
+        "systems": {
+            system_id: {
+                "system": async_redact_data(system.system, TO_REDACT),
+                "software": system.software,
+                "last_update_success": system.last_update_success,
+                "stale": system.stale,
+                "offline": system.offline,
+                "circuit": system.circuit.as_dict(),
+                "activity_cadence": (
+                    system.activity_cadence.total_seconds()
+                    if system.activity_cadence
+                    else None
+                ),
+                "climates": [climate.name for climate in system.climates],
+                "hotwaters": [hotwater.name for hotwater in system.hotwaters],
+                "ventilations": [
+                    ventilation.name for ventilation in system.ventilations
+                ],
+            }
+            for system_id, system in data.systems.items()
+        },
+    }
@@ -1,26 +1,129 @@
 """Base entities for nibe."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Optional
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TYPE_CHECKING, Any, Optional
 
-from homeassistant.core import callback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from nibeuplink.typing import ParameterId, ParameterType
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.update_coordinator import (
+    BaseCoordinatorEntity,
+    CoordinatorEntity,
+)
 
-from . import NibeSystem
+from . import NibeData, NibeSystem
+from .const import DATA_NIBE_ENTRIES
 from .const import DOMAIN as DOMAIN_NIBE
+from .const import SIGNAL_CONFIG_UPDATED, SIGNAL_SYSTEM_ADDED, SIGNAL_SYSTEM_UNLOADED
 
-ParameterSet = dict[ParameterId, Optional[ParameterType]]
+if TYPE_CHECKING:
+    from nibeuplink.typing import ParameterId, ParameterType
+
+    ParameterSet = dict[ParameterId, Optional[ParameterType]]
 
 _LOGGER = logging.getLogger(__name__)
 
 UNIT_ICON = {"A": "mdi:power-plug", "Hz": "mdi:update", "h": "mdi:clock"}
 
 
+async def async_load_entities(entities: Iterable[object]) -> None:
+    """Load parameters of entities before they are added.
+
+    The parameters of all entities of a system are loaded in one pass,
+    instead of each entity updating its own parameters before being added.
+    """
+    nibe_entities = [entity for entity in entities if isinstance(entity, NibeEntity)]
+
+    systems: dict[int, tuple[NibeSystem, set[ParameterId | None]]] = {}
+    for entity in nibe_entities:
+        _, parameters = systems.setdefault(entity._system_id, (entity._system, set()))
+        parameters |= entity._parameters
+
+    results = await asyncio.gather(
+        *[
+            system.async_load_parameters(parameters)
+            for system, parameters in systems.values()
+        ],
+        return_exceptions=True,
+    )
+    for system_id, result in zip(systems, results):
+        if isinstance(result, Exception):
+            _LOGGER.warning(
+                "Failed to load parameters for system %s: %s", system_id, result
+            )
+
+    for entity in nibe_entities:
+        entity.parse_data()
+
+
+async def async_setup_systems(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    add_systems: Callable[[list[NibeSystem]], Awaitable[None]],
+    update_config: Callable[[NibeSystem, str, list, list], Awaitable[None]]
+    | None = None,
+) -> None:
+    """Add entities for the systems of an entry, and for systems added later.
+
+    The optional update_config is called with the added and removed items
+    when a configuration key of a system changed on reload.
+    """
+    data: NibeData = hass.data[DATA_NIBE_ENTRIES][entry.entry_id]
+
+    if update_config:
+        entry.async_on_unload(
+            async_dispatcher_connect(
+                hass, SIGNAL_CONFIG_UPDATED.format(entry.entry_id), update_config
+            )
+        )
+
+    async def _system_added(system: NibeSystem):
+        await add_systems([system])
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_SYSTEM_ADDED.format(entry.entry_id), _system_added
+        )
+    )
+    await add_systems(list(data.systems.values()))
+
+
+async def async_remove_configured(
+    configured: dict[tuple[int, Any], Entity], system_id: int, items: list
+) -> None:
+    """Remove entities created from configuration items of a system.
+
+    The entities are removed from the entity registry as well, since
+    they are no longer configured.
+    """
+    for item in items:
+        if entity := configured.pop((system_id, item), None):
+            hass = entity.hass
+            await entity.async_remove()
+            if entity.registry_entry:
+                entity_registry.async_get(hass).async_remove(entity.entity_id)
+
+
+@callback
+def async_remove_with_system(entity: Entity, system_id: int) -> None:
+    """Remove entity from hass when its system is unloaded."""
+    entity.async_on_remove(
+        async_dispatcher_connect(
+            entity.hass, SIGNAL_SYSTEM_UNLOADED.format(system_id), entity.async_remove
+        )
+    )
+
+
 class NibeEntity(CoordinatorEntity[NibeSystem]):
     """Base class for all nibe system entities."""
 
+    _uses_statuses = False
+
     def __init__(
         self,
         system: NibeSystem,
@@ -119,8 +222,15 @@ class NibeEntity(CoordinatorEntity[NibeSystem]):
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
-        await super().async_added_to_hass()
-        self.async_on_remove(self._system.add_parameter_subscriber(self._parameters))
+        # Bypass the coordinator listener, the system will only notify
+        # us when any of our parameters has changed.
+        await super(BaseCoordinatorEntity, self).async_added_to_hass()
+        async_remove_with_system(self, self._system_id)
+        self.async_on_remove(
+            self._system.add_parameter_subscriber(
+                self._parameters, self._handle_coordinator_update, self._uses_statuses
+            )
+        )
 
     async def async_update(self):
         """Handle request to update this entity."""
@@ -167,9 +277,10 @@ class NibeParameterEntity(NibeEntity):
                 "display_value": data["displayValue"],
                 "raw_value": data["rawValue"],
                 "display_unit": data["unit"],
+                "stale": self._system.stale,
             }
         else:
-            return {}
+            return {"stale": self._system.stale}
 
     @property
     def available(self):
@@ -1,18 +1,19 @@
 """FAN for nibe."""
 from __future__ import annotations
 
-import asyncio
 import logging
+from typing import TYPE_CHECKING
 
 from homeassistant.components.fan import ENTITY_ID_FORMAT, FanEntity, FanEntityFeature
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from nibeuplink import VentilationSystem, get_active_ventilations
 
-from . import NibeData, NibeSystem
-from .const import DATA_NIBE_ENTRIES
+from . import NibeSystem
 from .const import DOMAIN as DOMAIN_NIBE
-from .entity import NibeEntity
+from .entity import NibeEntity, async_load_entities, async_setup_systems
+
+if TYPE_CHECKING:
+    from nibeuplink import VentilationSystem
 
 PARALLEL_UPDATES = 0
 _LOGGER = logging.getLogger(__name__)
@@ -24,20 +25,17 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
 ):
     """Set up the climate device based on a config entry."""
-    data: NibeData = hass.data[DATA_NIBE_ENTRIES][entry.entry_id]
-    uplink = data.uplink
-    systems = data.systems
-
-    entities = []
 
-    async def add_active(system: NibeSystem):
-        ventilations = await get_active_ventilations(uplink, system.system_id)
-        for ventilation in ventilations.values():
-            entities.append(NibeFan(system, ventilation))
+    async def add_systems(systems: list[NibeSystem]):
+        entities = []
+        for system in systems:
+            for ventilation in system.ventilations:
+                entities.append(NibeFan(system, ventilation))
 
-    await asyncio.gather(*[add_active(system) for system in systems.values()])
+        await async_load_entities(entities)
+        async_add_entities(entities)
 
-    async_add_entities(entities, True)
+    await async_setup_systems(hass, entry, add_systems)
 
 
 class NibeFan(NibeEntity, FanEntity):
@@ -105,6 +103,7 @@ class NibeFan(NibeEntity, FanEntity):
         data["ventilation_boost_raw"] = self.get_raw(
             self._ventilation.ventilation_boost
         )
+        data["stale"] = self._system.stale
         return data
 
     # pylint: disable=arguments-differ
@@ -116,8 +115,7 @@ class NibeFan(NibeEntity, FanEntity):
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the fan."""
         assert self._ventilation.ventilation_boost, "Ventilation boost not supported"
-        await self._uplink.put_parameter(
-            self._system_id,
+        await self._system.put_parameter(
             self._ventilation.ventilation_boost,
             PRESET_VALUES[preset_mode],
         )
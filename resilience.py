@@ -0,0 +1,117 @@
+"""Retries and circuit breaking for nibe uplink requests."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, TypeVar
+
+import aiohttp
+
+from .throttle import is_congestion
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 30.0
+
+CIRCUIT_FAILURES = 3
+CIRCUIT_COOLDOWN = 300.0
+CIRCUIT_MAX_COOLDOWN = 3600.0
+
+
+def is_transient(exc: BaseException | None) -> bool:
+    """Return if a failed request is worth retrying."""
+    if is_congestion(exc):
+        return True
+    while exc is not None:
+        if isinstance(exc, aiohttp.ClientConnectionError):
+            return True
+        exc = exc.__cause__
+    return False
+
+
+async def async_retry(
+    func: Callable[[], Awaitable[_T]], attempts: int = RETRY_ATTEMPTS
+) -> _T:
+    """Call func, retrying transient failures with jittered exponential backoff."""
+    attempt = 0
+    while True:
+        try:
+            return await func()
+        except Exception as exc:
+            attempt += 1
+            if attempt >= attempts or not is_transient(exc):
+                raise
+            delay = random.uniform(
+                0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            )
+            _LOGGER.debug("Retrying request in %.1f seconds after %r", delay, exc)
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """Stop requesting from a failing system for a while.
+
+    The circuit opens after a number of consecutive failures. Once the
+    cooldown has passed a single attempt is let through, which closes the
+    circuit on success, or opens it again for twice as long on failure.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failures: int = CIRCUIT_FAILURES,
+        cooldown: float = CIRCUIT_COOLDOWN,
+    ) -> None:
+        """Init."""
+        self.name = name
+        self.threshold = failures
+        self.failures = 0
+        self._base_cooldown = cooldown
+        self._cooldown = cooldown
+        self._open_until: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return if the circuit is open."""
+        return self._open_until is not None
+
+    def allow(self) -> bool:
+        """Return if a request may be attempted."""
+        return self._open_until is None or time.monotonic() >= self._open_until
+
+    def success(self) -> None:
+        """Record a successful attempt."""
+        if self._open_until is not None:
+            _LOGGER.info("Circuit closed for %s", self.name)
+        self.failures = 0
+        self._cooldown = self._base_cooldown
+        self._open_until = None
+
+    def failure(self) -> None:
+        """Record a failed attempt."""
+        self.failures += 1
+        if self._open_until is not None:
+            self._cooldown = min(CIRCUIT_MAX_COOLDOWN, self._cooldown * 2)
+        elif self.failures < self.threshold:
+            return
+        _LOGGER.warning(
+            "Circuit opened for %s after %d failures, retrying in %.0f seconds",
+            self.name,
+            self.failures,
+            self._cooldown,
+        )
+        self._open_until = time.monotonic() + self._cooldown
+
+    def as_dict(self) -> dict[str, float | int | bool]:
+        """Return state for diagnostics."""
+        return {
+            "open": self.is_open,
+            "failures": self.failures,
+            "cooldown": self._cooldown,
+        }
@@ -0,0 +1,274 @@
+"""Benchmark import and setup time of the nibe integration.
+
+Setup is measured against a fake uplink, so no network access or account
+is needed. Requires homeassistant, nibeuplink and
+pytest-homeassistant-custom-component to be installed.
+
+    python scripts/benchmark.py --systems 2 --latency 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+DOMAIN = "nibe"
+
+IMPORT_PROBE = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+import homeassistant.core, homeassistant.helpers.config_validation
+start = time.perf_counter()
+import custom_components.nibe
+print(time.perf_counter() - start, "nibeuplink" in sys.modules)
+"""
+
+
+def create_config_dir(base: str) -> str:
+    """Create a config dir with the integration linked as a custom component."""
+    config_dir = Path(base)
+    (config_dir / "custom_components").mkdir(parents=True)
+    (config_dir / "custom_components" / DOMAIN).symlink_to(ROOT)
+    return str(config_dir)
+
+
+class FakeSession:
+    """Session that never talks to the cloud."""
+
+    def __init__(self, *args, access_data=None, **kwargs) -> None:
+        """Init."""
+        self.access_data = access_data
+
+    async def open(self):
+        """Open session."""
+
+    async def close(self):
+        """Close session."""
+
+
+class FakeUplink:
+    """Uplink serving synthetic systems with a fixed latency per request."""
+
+    systems = 1
+    units = 2
+    categories = 5
+    parameters = 10
+    latency = 0.0
+
+    def __init__(self, session, *args, **kwargs) -> None:
+        """Init."""
+        self.session = session
+        self.requests = 0
+
+    async def _request(self):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+
+    def _parameter(self, parameter_id):
+        return {
+            "parameterId": parameter_id,
+            "title": f"parameter {parameter_id}",
+            "designation": "",
+            "unit": "°C",
+            "displayValue": "20.0°C",
+            "rawValue": 200,
+            "value": 20.0,
+        }
+
+    async def get_systems(self):
+        """Get systems."""
+        await self._request()
+        return [
+            {
+                "systemId": system_id,
+                "name": f"System {system_id}",
+                "productName": "F1255",
+                "productImage": {},
+                "securityLevel": "ADMIN",
+                "serialNumber": str(system_id),
+                "lastActivityDate": "2020-01-01T00:00:00Z",
+                "connectionStatus": "ONLINE",
+                "address": None,
+                "hasAlarmed": False,
+            }
+            for system_id in range(1, self.systems + 1)
+        ]
+
+    async def get_system_software(self, system_id):
+        """Get system software."""
+        await self._request()
+        return {
+            "current": {"name": "1.0.0", "version": 1, "release": 1},
+            "upgrade": None,
+        }
+
+    async def get_status(self, system_id):
+        """Get status icons."""
+        await self._request()
+        return []
+
+    async def get_notifications(self, system_id, *args, **kwargs):
+        """Get notifications."""
+        await self._request()
+        return []
+
+    async def get_units(self, system_id):
+        """Get units."""
+        await self._request()
+        return [
+            {
+                "systemUnitId": unit_id,
+                "name": f"Unit {unit_id}",
+                "shortName": f"U{unit_id}",
+                "product": "F1255",
+                "softwareVersion": "1.0.0",
+            }
+            for unit_id in range(self.units)
+        ]
+
+    async def get_categories(self, system_id, parameters, unit_id=0):
+        """Get categories of a unit."""
+        await self._request()
+        base = 10000 * (unit_id + 1)
+        return [
+            {
+                "categoryId": f"CATEGORY_{index}",
+                "name": f"Category {index}",
+                "parameters": [
+                    self._parameter(base + index * 100 + parameter)
+                    for parameter in range(self.parameters)
+                ],
+            }
+            for index in range(self.categories)
+        ]
+
+    async def get_parameter(self, system_id, parameter_id):
+        """Get a parameter."""
+        await self._request()
+        return self._parameter(parameter_id)
+
+    async def put_parameter(self, system_id, parameter_id, value):
+        """Set a parameter."""
+        await self._request()
+        return "DONE"
+
+
+def benchmark_import(iterations: int) -> list[float]:
+    """Time importing the integration in fresh interpreters."""
+    times = []
+    with tempfile.TemporaryDirectory() as base:
+        config_dir = create_config_dir(base)
+        for _ in range(iterations):
+            output = subprocess.run(
+                [sys.executable, "-c", IMPORT_PROBE, config_dir],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            times.append(float(output[0]))
+            if output[1] == "True":
+                print("warning: nibeuplink is imported with the integration")
+    return times
+
+
+async def benchmark_setup(iterations: int) -> dict[str, list[float]]:
+    """Time setting up a config entry cold, and reloading it warm."""
+    from homeassistant import loader
+    from homeassistant.config_entries import ConfigEntryState
+    from homeassistant.setup import async_setup_component
+    from pytest_homeassistant_custom_component.common import (
+        MockConfigEntry,
+        async_test_home_assistant,
+    )
+
+    results: dict[str, list[float]] = {"cold": [], "warm": [], "entities": []}
+    for _ in range(iterations):
+        with tempfile.TemporaryDirectory() as base:
+            config_dir = create_config_dir(base)
+            async with async_test_home_assistant(config_dir=config_dir) as hass:
+                hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+                assert await async_setup_component(hass, DOMAIN, {DOMAIN: {}})
+
+                entry = MockConfigEntry(
+                    domain=DOMAIN,
+                    data={
+                        "client_id": "id",
+                        "client_secret": "secret",
+                        "redirect_uri": "http://localhost/api/nibe/auth",
+                        "access_data": {"access_token": "token"},
+                    },
+                )
+                entry.add_to_hass(hass)
+
+                start = time.perf_counter()
+                assert await hass.config_entries.async_setup(entry.entry_id)
+                await hass.async_block_till_done()
+                results["cold"].append(time.perf_counter() - start)
+                assert entry.state is ConfigEntryState.LOADED
+
+                start = time.perf_counter()
+                assert await hass.config_entries.async_reload(entry.entry_id)
+                await hass.async_block_till_done()
+                results["warm"].append(time.perf_counter() - start)
+
+                results["entities"].append(len(hass.states.async_all()))
+                await hass.config_entries.async_unload(entry.entry_id)
+    return results
+
+
+def summary(values: list[float]) -> dict[str, float]:
+    """Summarize timings in milliseconds."""
+    return {
+        "min_ms": round(min(values) * 1000, 2),
+        "median_ms": round(statistics.median(values) * 1000, 2),
+        "max_ms": round(max(values) * 1000, 2),
+    }
+
+
+def main():
+    """Run benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--systems", type=int, default=1)
+    parser.add_argument("--units", type=int, default=2)
+    parser.add_argument("--categories", type=int, default=5)
+    parser.add_argument("--parameters", type=int, default=10)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per fake request"
+    )
+    parser.add_argument("--skip-import", action="store_true")
+    parser.add_argument("--skip-setup", action="store_true")
+    args = parser.parse_args()
+
+    FakeUplink.systems = args.systems
+    FakeUplink.units = args.units
+    FakeUplink.categories = args.categories
+    FakeUplink.parameters = args.parameters
+    FakeUplink.latency = args.latency
+
+    result = {}
+    if not args.skip_import:
+        result["import"] = summary(benchmark_import(args.iterations))
+
+    if not args.skip_setup:
+        with patch("nibeuplink.Uplink", FakeUplink), patch(
+            "nibeuplink.UplinkSession", FakeSession
+        ):
+            setup = asyncio.run(benchmark_setup(args.iterations))
+        result["setup_cold"] = summary(setup["cold"])
+        result["setup_warm"] = summary(setup["warm"])
+        result["entities"] = max(setup["entities"])
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
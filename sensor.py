@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Callable
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable
 
 from homeassistant.components.sensor import (
     ENTITY_ID_FORMAT,
@@ -21,16 +22,26 @@ from homeassistant.const import (
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util.dt import parse_datetime
-from nibeuplink.typing import CategoryType, ParameterId, SystemUnit
+from homeassistant.util.dt import parse_datetime, utcnow
 
-from . import NibeData, NibeSystem
+from . import NibeData, NibeSystem, gather_limited
 from .const import CONF_SENSORS, DATA_NIBE_ENTRIES
 from .const import DOMAIN as DOMAIN_NIBE
-from .entity import NibeParameterEntity
+from .const import SETUP_CONCURRENCY
+from .entity import (
+    NibeParameterEntity,
+    async_load_entities,
+    async_remove_configured,
+    async_remove_with_system,
+    async_setup_systems,
+)
+
+if TYPE_CHECKING:
+    from nibeuplink.typing import CategoryType, ParameterId, SystemUnit
 
 PARALLEL_UPDATES = 0
 _LOGGER = logging.getLogger(__name__)
@@ -44,6 +55,7 @@ async def async_setup_entry(
     uplink = data.uplink
 
     done: set[tuple[int, int]] = set()
+    configured: dict[tuple[int, ParameterId], NibeSensor] = {}
 
     def once(system_id: int, parameter_id: int):
         nonlocal done
@@ -53,7 +65,13 @@ async def async_setup_entry(
         done.add(key)
         return True
 
-    def add_category(system: NibeSystem, category: CategoryType, unit: SystemUnit):
+    def category_sensors(
+        system: NibeSystem,
+        category: CategoryType,
+        unit: SystemUnit,
+        fetched: datetime | None,
+        devices: list[DeviceInfo],
+    ) -> list[NibeSensor]:
         device_info = DeviceInfo(
             configuration_url=f"https://nibeuplink.com/System/{system.system_id}",
             identifiers={
@@ -75,7 +93,7 @@ async def async_setup_entry(
             if not once(system.system_id, parameter["parameterId"]):
                 continue
 
-            system.set_parameter(parameter["parameterId"], parameter)
+            system.set_parameter(parameter["parameterId"], parameter, fetched)
             entities.append(
                 NibeSensor(
                     system,
@@ -84,40 +102,111 @@ async def async_setup_entry(
                     PARAMETER_SENSORS_LOOKUP.get(str(parameter["parameterId"])),
                 )
             )
+        if entities:
+            devices.append(device_info)
+        return entities
 
-        async_add_entities(entities)
+    def configured_sensors(
+        system: NibeSystem, sensor_ids: list[ParameterId]
+    ) -> list[NibeSensor]:
+        entities = []
+        for sensor_id in sensor_ids:
+            if not once(system.system_id, sensor_id):
+                continue
+            entity = NibeSensor(
+                system,
+                sensor_id,
+                DeviceInfo(identifiers={(DOMAIN_NIBE, system.system_id)}),
+                PARAMETER_SENSORS_LOOKUP.get(str(sensor_id)),
+            )
+            configured[(system.system_id, sensor_id)] = entity
+            entities.append(entity)
+        return entities
 
-    def add_sensors(system: NibeSystem):
-        async_add_entities(
-            [
-                NibeSensor(
-                    system,
-                    sensor_id,
-                    DeviceInfo(identifiers={(DOMAIN_NIBE, system.system_id)}),
-                    PARAMETER_SENSORS_LOOKUP.get(str(sensor_id)),
-                )
-                for sensor_id in system.config[CONF_SENSORS]
-                if once(system.system_id, sensor_id)
+    async def discover_categories(system: NibeSystem):
+        units = await uplink.get_units(system.system_id)
+        units_categories = await gather_limited(
+            SETUP_CONCURRENCY,
+            *[
+                uplink.get_categories(system.system_id, True, unit["systemUnitId"])
+                for unit in units
             ],
-            True,
         )
+        return {
+            "fetched": utcnow().isoformat(),
+            "units": [
+                {"unit": unit, "categories": categories}
+                for unit, categories in zip(units, units_categories)
+            ],
+        }
+
+    def categories_signature(topology):
+        return [
+            (
+                item["unit"]["systemUnitId"],
+                [
+                    (
+                        category["categoryId"],
+                        [x["parameterId"] for x in category["parameters"] or []],
+                    )
+                    for category in item["categories"]
+                ],
+            )
+            for item in topology["units"]
+        ]
 
-        async_add_entities(
-            [NibeSystemSensor(system, description) for description in SYSTEM_SENSORS]
+    async def load_system(system: NibeSystem):
+        # Start over for systems added again after being unloaded
+        done.difference_update({key for key in done if key[0] == system.system_id})
+        topology = await data.topology.async_discover(
+            entry,
+            system,
+            "categories",
+            lambda: discover_categories(system),
+            categories_signature,
+        )
+        fetched = parse_datetime(topology["fetched"])
+        # Categories of all units are fetched in one concurrent pass, so
+        # entities are added once per system rather than per category
+        devices: list[DeviceInfo] = []
+        entities: list[SensorEntity] = []
+        # Add in unit order, so parameters shared between units
+        # always end up on the same device.
+        for item in topology["units"]:
+            for category in item["categories"]:
+                entities.extend(
+                    category_sensors(system, category, item["unit"], fetched, devices)
+                )
+        entities.extend(configured_sensors(system, system.config[CONF_SENSORS]))
+        entities.extend(
+            NibeSystemSensor(system, description) for description in SYSTEM_SENSORS
         )
 
-    async def load_system(system: NibeSystem):
-        units = await uplink.get_units(system.system_id)
-        for unit in units:
-            categories = await uplink.get_categories(
-                system.system_id, True, unit["systemUnitId"]
-            )
-            for category in categories:
-                add_category(system, category, unit)
-        add_sensors(system)
+        # Register devices up front, so entities only need to link to them
+        reg = device_registry.async_get(hass)
+        for device_info in devices:
+            reg.async_get_or_create(config_entry_id=entry.entry_id, **device_info)
+
+        await async_load_entities(entities)
+        async_add_entities(entities)
+
+    async def add_systems(systems: list[NibeSystem]):
+        await gather_limited(
+            SETUP_CONCURRENCY, *[load_system(system) for system in systems]
+        )
+
+    async def update_config(system: NibeSystem, key: str, added: list, removed: list):
+        if key != CONF_SENSORS:
+            return
+        for sensor_id in removed:
+            if (system.system_id, sensor_id) in configured:
+                done.discard((system.system_id, sensor_id))
+        await async_remove_configured(configured, system.system_id, removed)
+        entities = configured_sensors(system, added)
+        await async_load_entities(entities)
+        async_add_entities(entities)
 
-    for system in data.systems.values():
-        await load_system(system)
+    await async_setup_systems(hass, entry, add_systems, update_config)
 
 
 @dataclass
@@ -343,6 +432,19 @@ SYSTEM_SENSORS: tuple[NibeSystemSensorEntityDescription, ...] = (
         state_fn=lambda x: len(x.statuses),
         attributes_fn=lambda x: {"statuses": x.statuses},
     ),
+    NibeSystemSensorEntityDescription(
+        key="requestBudget",
+        name="request budget",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="requests",
+        icon="mdi:speedometer",
+        state_fn=lambda x: x.budget.remaining,
+        attributes_fn=lambda x: {
+            "capacity": x.budget.capacity,
+            "per_minute": x.budget.per_minute,
+        },
+    ),
 )
 
 
@@ -365,6 +467,11 @@ class NibeSystemSensor(CoordinatorEntity[NibeSystem], SensorEntity):
             system.system_id, description.key.lower()
         )
 
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        async_remove_with_system(self, self._system.system_id)
+
     @property
     def native_value(self) -> StateType:
         """Get the state data from system class."""
@@ -3,12 +3,12 @@ from __future__ import annotations
 
 import json
 import logging
+from typing import TYPE_CHECKING
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.const import ATTR_NAME, ATTR_TEMPERATURE
 from homeassistant.helpers.event import async_call_later
-from nibeuplink.uplink import Uplink
 
 from .const import (
     ATTR_TARGET_TEMPERATURE,
@@ -16,11 +16,15 @@ from .const import (
     DATA_NIBE_ENTRIES,
     DOMAIN,
     SERVICE_GET_PARAMETER,
+    SERVICE_RELOAD,
     SERVICE_SET_PARAMETER,
     SERVICE_SET_SMARTHOME_MODE,
     SERVICE_SET_THERMOSTAT,
 )
 
+if TYPE_CHECKING:
+    from . import NibeSystem
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -55,41 +59,53 @@ def async_track_delta_time(hass, delta, callable):
     return remover
 
 
+def parameter_id(value):
+    """Validate a parameter identifier, numeric identifiers as int."""
+    value = cv.string(value)
+    if value.isdigit():
+        return int(value)
+    return value
+
+
 async def async_register_services(hass):
     """Register public services."""
     from nibeuplink import SMARTHOME_MODES, SetThermostatModel
 
-    def _find_uplink(system: int) -> Uplink:
+    def _find_system(system: int) -> NibeSystem:
         from . import NibeData
 
         entries: dict[str, NibeData] = hass.data[DATA_NIBE_ENTRIES]
         for data in entries.values():
             if system in data.systems:
-                return data.uplink
+                return data.systems[system]
         else:
             raise Exception(f"Can't find uplink with system identifier {system}")
 
     async def set_smarthome_mode(call):
         """Set smarthome mode."""
-        uplink = _find_uplink(call.data["system"])
-        await uplink.put_smarthome_mode(call.data["system"], call.data["mode"])
+        system = _find_system(call.data["system"])
+        await system.async_create_write_task(
+            system.uplink.put_smarthome_mode(call.data["system"], call.data["mode"]),
+            "Nibe put smarthome mode",
+        )
 
     async def set_parameter(call):
-        uplink = _find_uplink(call.data["system"])
-        await uplink.put_parameter(
-            call.data["system"], call.data["parameter"], call.data["value"]
-        )
+        system = _find_system(call.data["system"])
+        await system.put_parameter(call.data["parameter"], call.data["value"])
 
     async def get_parameter(call):
-        uplink = _find_uplink(call.data["system"])
-        data = await uplink.get_parameter(call.data["system"], call.data["parameter"])
+        system = _find_system(call.data["system"])
+        parameter_id = call.data["parameter"]
+        data = await system.fetch_parameter(parameter_id)
+        # Keep the value cached only if an entity uses it
+        system.async_evict_unreferenced({parameter_id})
 
         hass.components.persistent_notification.async_create(
             json.dumps(data, indent=1), "Nibe get parameter result"
         )
 
     async def set_thermostat(call):
-        uplink = _find_uplink(call.data["system"])
+        system = _find_system(call.data["system"])
 
         def scaled(value, multi=10):
             if value is None:
@@ -107,7 +123,16 @@ async def async_register_services(hass):
         )
 
         _LOGGER.debug(f"Publish thermostat {data}")
-        await uplink.post_smarthome_thermostats(call.data["system"], data)
+        await system.async_create_write_task(
+            system.uplink.post_smarthome_thermostats(call.data["system"], data),
+            f"Nibe publish thermostat {call.data['id']}",
+        )
+
+    async def reload(call):
+        """Reload yaml configuration of systems."""
+        from . import async_reload_config
+
+        await async_reload_config(hass)
 
     SERVICE_SET_SMARTHOME_MODE_SCHEMA = vol.Schema(
         {
@@ -119,13 +144,16 @@ async def async_register_services(hass):
     SERVICE_SET_PARAMETER_SCHEMA = vol.Schema(
         {
             vol.Required("system"): cv.positive_int,
-            vol.Required("parameter"): cv.string,
+            vol.Required("parameter"): parameter_id,
             vol.Required("value"): cv.string,
         }
     )
 
     SERVICE_GET_PARAMETER_SCHEMA = vol.Schema(
-        {vol.Required("system"): cv.positive_int, vol.Required("parameter"): cv.string}
+        {
+            vol.Required("system"): cv.positive_int,
+            vol.Required("parameter"): parameter_id,
+        }
     )
 
     SERVICE_SET_THERMOSTAT_SCHEMA = vol.Schema(
@@ -164,3 +192,5 @@ async def async_register_services(hass):
     hass.services.async_register(
         DOMAIN, SERVICE_SET_THERMOSTAT, set_thermostat, SERVICE_SET_THERMOSTAT_SCHEMA
     )
+
+    hass.services.async_register(DOMAIN, SERVICE_RELOAD, reload)
@@ -0,0 +1,224 @@
+"""Persistent storage for nibe uplink."""
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, TypeVar
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from nibeuplink.typing import System
+
+    from . import NibeSystem
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+STORAGE_VERSION = 1
+STORAGE_KEY_TOPOLOGY = "nibe.topology"
+TOPOLOGY_SAVE_DELAY = 10
+TOPOLOGY_MAX_AGE = timedelta(days=7)
+STORAGE_KEY_PARAMETERS = "nibe.parameters"
+PARAMETERS_SAVE_DELAY = 60
+STORAGE_KEY_SYSTEMS = "nibe.systems"
+
+
+def _software_name(system: NibeSystem) -> str | None:
+    if system.software:
+        return system.software["current"]["name"]
+    return None
+
+
+class NibeTopology:
+    """Discovered topology of systems, kept between restarts.
+
+    Entries are stored per system and dropped when the system reports
+    a different software version than when they were discovered. Each
+    entry is revalidated once it is older than TOPOLOGY_MAX_AGE.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init."""
+        self.hass = hass
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_TOPOLOGY
+        )
+        self._data: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load topology from storage."""
+        self._data = await self._store.async_load() or {}
+
+    def get(self, system: NibeSystem, key: str) -> Any | None:
+        """Get cached topology for a system."""
+        if (data := self._data.get(str(system.system_id))) is None:
+            return None
+        software = _software_name(system)
+        if software is not None and data["software"] != software:
+            return None
+        return data.get(key)
+
+    def is_complete(self, system_id: int, keys: Iterable[str]) -> bool:
+        """Return if topology is stored for all keys of a system."""
+        data = self._data.get(str(system_id), {})
+        return all(key in data for key in keys)
+
+    def set(self, system: NibeSystem, key: str, value: Any) -> None:
+        """Store topology for a system."""
+        software = _software_name(system)
+        data = self._data.get(str(system.system_id))
+        if data is None or data["software"] != software:
+            data = self._data[str(system.system_id)] = {"software": software}
+        data[key] = value
+        data.setdefault("validated", {})[key] = dt_util.utcnow().isoformat()
+        self._store.async_delay_save(lambda: self._data, TOPOLOGY_SAVE_DELAY)
+
+    async def async_discover(
+        self,
+        entry: ConfigEntry,
+        system: NibeSystem,
+        key: str,
+        discover: Callable[[], Awaitable[_T]],
+        signature: Callable[[_T], Any] = lambda x: x,
+    ) -> _T:
+        """Return topology for system, from cache if available.
+
+        Cached topology past its max age is revalidated in the background,
+        and the entry is reloaded if the signature of the discovered
+        topology changed.
+        """
+        cached = self.get(system, key)
+        if cached is None:
+            value = await discover()
+            self.set(system, key, value)
+            return value
+
+        if not self._expired(system, key):
+            return cached
+
+        async def _revalidate():
+            await system.ready.wait()
+            value = await discover()
+            self.set(system, key, value)
+            if signature(value) != signature(cached):
+                _LOGGER.info(
+                    "Topology %s changed for system %s, reloading",
+                    key,
+                    system.system_id,
+                )
+                self.hass.config_entries.async_schedule_reload(entry.entry_id)
+
+        entry.async_create_background_task(
+            self.hass, _revalidate(), f"Nibe revalidate {key} {system.system_id}"
+        )
+        return cached
+
+    def _expired(self, system: NibeSystem, key: str) -> bool:
+        validated = self._data[str(system.system_id)].get("validated", {}).get(key)
+        if validated is None or (time := dt_util.parse_datetime(validated)) is None:
+            return True
+        return dt_util.utcnow() - time >= TOPOLOGY_MAX_AGE
+
+
+class NibeParameterCache:
+    """Last known parameter values of systems, kept between restarts."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init."""
+        self.hass = hass
+        self._store: Store[dict[str, list[list[Any]]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_PARAMETERS
+        )
+        self._data: dict[str, list[list[Any]]] = {}
+        self._systems: dict[int, NibeSystem] = {}
+
+    async def async_load(self) -> None:
+        """Load parameters from storage."""
+        self._data = await self._store.async_load() or {}
+
+    @callback
+    def async_restore(self, system: NibeSystem) -> bool:
+        """Restore last known parameters of system, return if any was restored."""
+        restored = False
+        for parameter_id, data, fetched in self._data.get(str(system.system_id), []):
+            if (fetched_time := dt_util.parse_datetime(fetched)) is not None:
+                system.set_parameter(parameter_id, data, fetched_time)
+                restored = True
+        return restored
+
+    @callback
+    def async_track(self, system: NibeSystem) -> CALLBACK_TYPE:
+        """Save parameters of system as they update."""
+
+        @callback
+        def _updated():
+            self._store.async_delay_save(self._data_to_save, PARAMETERS_SAVE_DELAY)
+
+        unsub = system.async_add_listener(_updated)
+        self._systems[system.system_id] = system
+
+        @callback
+        def _remove():
+            unsub()
+            # Keep the last values, the system is no longer tracked on save
+            self.async_save(system)
+            del self._systems[system.system_id]
+
+        return _remove
+
+    @callback
+    def async_save(self, system: NibeSystem) -> None:
+        """Save the current parameters of a system."""
+        self._snapshot(system)
+        self._store.async_delay_save(self._data_to_save, PARAMETERS_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, system_id: int) -> None:
+        """Drop stored parameters of a system that is no longer used."""
+        if self._data.pop(str(system_id), None) is not None:
+            self._store.async_delay_save(self._data_to_save, PARAMETERS_SAVE_DELAY)
+
+    def _snapshot(self, system: NibeSystem) -> None:
+        # Parameters are released as entities unload, which must not
+        # wipe the values stored for the next start
+        if parameters := system.stored_parameters():
+            self._data[str(system.system_id)] = [
+                [parameter_id, data, fetched.isoformat()]
+                for parameter_id, data, fetched in parameters
+            ]
+
+    @callback
+    def _data_to_save(self) -> dict[str, list[list[Any]]]:
+        for system in self._systems.values():
+            self._snapshot(system)
+        return self._data
+
+
+class NibeSystemsCache:
+    """Systems available to each config entry, kept between restarts."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init."""
+        self.hass = hass
+        self._store: Store[dict[str, list[System]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_SYSTEMS
+        )
+        self._data: dict[str, list[System]] = {}
+
+    async def async_load(self) -> None:
+        """Load systems from storage."""
+        self._data = await self._store.async_load() or {}
+
+    def get(self, entry_id: str) -> list[System] | None:
+        """Get cached systems of a config entry."""
+        return self._data.get(entry_id)
+
+    def set(self, entry_id: str, systems: list[System]) -> None:
+        """Store systems of a config entry."""
+        self._data[entry_id] = systems
+        self._store.async_delay_save(lambda: self._data, TOPOLOGY_SAVE_DELAY)
@@ -12,9 +12,14 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 
-from . import NibeData, NibeSystem
-from .const import CONF_SWITCHES, DATA_NIBE_ENTRIES
-from .entity import NibeParameterEntity
+from . import NibeSystem
+from .const import CONF_SWITCHES
+from .entity import (
+    NibeParameterEntity,
+    async_load_entities,
+    async_remove_configured,
+    async_setup_systems,
+)
 
 PARALLEL_UPDATES = 0
 _LOGGER = logging.getLogger(__name__)
@@ -32,20 +37,38 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
 ):
     """Set up the device based on a config entry."""
-    data: NibeData = hass.data[DATA_NIBE_ENTRIES][entry.entry_id]
+    configured: dict[tuple[int, str], NibeSwitch] = {}
+
+    def create(system: NibeSystem, parameter_ids: list[str]):
+        entities = []
+        for parameter_id in set(parameter_ids) - PARAMETER_SWITCHES_IDS:
+            entity = NibeSwitch(system, parameter_id)
+            configured[(system.system_id, parameter_id)] = entity
+            entities.append(entity)
+        return entities
+
+    async def add_systems(systems: list[NibeSystem]):
+        entities = []
+        for system in systems:
+            for entity_description in PARAMETER_SWITCHES:
+                entities.append(
+                    NibeSwitch(system, int(entity_description.key), entity_description)
+                )
+
+            entities.extend(create(system, system.config[CONF_SWITCHES]))
 
-    entities = []
-    for system in data.systems.values():
-        for entity_description in PARAMETER_SWITCHES:
-            entities.append(
-                NibeSwitch(system, int(entity_description.key), entity_description)
-            )
+        await async_load_entities(entities)
+        async_add_entities(entities)
 
-        parameters = set(system.config[CONF_SWITCHES]) - PARAMETER_SWITCHES_IDS
-        for parameter_id in parameters:
-            entities.append(NibeSwitch(system, parameter_id))
+    async def update_config(system: NibeSystem, key: str, added: list, removed: list):
+        if key != CONF_SWITCHES:
+            return
+        await async_remove_configured(configured, system.system_id, removed)
+        entities = create(system, added)
+        await async_load_entities(entities)
+        async_add_entities(entities)
 
-    async_add_entities(entities, True)
+    await async_setup_systems(hass, entry, add_systems, update_config)
 
 
 class NibeSwitch(NibeParameterEntity, SwitchEntity):
@@ -72,8 +95,8 @@ class NibeSwitch(NibeParameterEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs):
         """Turn entity on."""
-        await self._uplink.put_parameter(self._system_id, self._parameter_id, "1")
+        await self._system.put_parameter(self._parameter_id, "1")
 
     async def async_turn_off(self, **kwargs):
         """Turn entity off."""
-        await self._uplink.put_parameter(self._system_id, self._parameter_id, "0")
+        await self._system.put_parameter(self._parameter_id, "0")
@@ -0,0 +1,17 @@
+"""Fixtures for nibe tests.
+
+Tests run with pytest-homeassistant-custom-component, with the repository
+linked into a config dir as the nibe custom component.
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_config_dir = Path(tempfile.mkdtemp())
+(_config_dir / "custom_components").mkdir()
+(_config_dir / "custom_components" / "nibe").symlink_to(ROOT)
+sys.path.insert(0, str(_config_dir))
@@ -0,0 +1,53 @@
+"""Tests for refreshing systems on activity."""
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+from custom_components.nibe import SYSTEM_SCHEMA, NibeSystem, NibeSystemsCoordinator
+from custom_components.nibe.const import DOMAIN
+from custom_components.nibe.throttle import RequestBudget
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+SYSTEM = {
+    "systemId": 1,
+    "name": "System 1",
+    "productName": "F1255",
+    "lastActivityDate": "2020-01-01T00:00:00Z",
+    "connectionStatus": "ONLINE",
+}
+
+
+async def test_refresh_without_new_activity(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Parameters are refreshed on the interval while activity never changes."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    uplink = AsyncMock()
+    uplink.get_parameter.return_value = {"parameterId": 40004, "value": 1.0}
+    uplink.get_status.return_value = []
+    uplink.get_notifications.return_value = []
+    uplink.get_system_software.return_value = {
+        "current": {"name": "1.0.0"},
+        "upgrade": None,
+    }
+    parent = NibeSystemsCoordinator(hass, uplink, RequestBudget())
+    parent.config_entry = entry
+
+    system = NibeSystem(
+        hass, SYSTEM, SYSTEM_SCHEMA({"refresh_on_activity": True}), parent
+    )
+    system.add_parameter_subscriber({40004})
+
+    for _ in range(4):
+        await system.async_refresh()
+        freezer.tick(timedelta(minutes=10))
+
+    assert system.activity_cadence is None
+    assert uplink.get_parameter.await_count == 4
+
+    await system.unload()
@@ -0,0 +1,194 @@
+"""Adaptive request throttling for nibe uplink."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Requests per minute
+INITIAL_LIMIT = 60 / 4.5
+MIN_LIMIT = 1.0
+
+BACKOFF_FACTOR = 0.5
+SLOW_FACTOR = 0.75
+SLOW_RESPONSE = 5.0
+
+# Requests shared by all uplinks of an application
+BUDGET_CAPACITY = 30
+BUDGET_PER_MINUTE = 15.0
+RATE_LIMIT_PAUSE = 60.0
+
+ERROR_RATE_LIMIT = 28
+
+
+def is_congestion(exc: BaseException | None) -> bool:
+    """Return if an exception indicates the api is overloaded."""
+    while exc is not None:
+        if isinstance(exc, (asyncio.TimeoutError, aiohttp.ServerConnectionError)):
+            return True
+        if isinstance(exc, aiohttp.ClientResponseError):
+            return exc.status == 429 or exc.status >= 500
+        if getattr(exc, "code", None) == ERROR_RATE_LIMIT:
+            return True
+        exc = exc.__cause__
+    return False
+
+
+def rate_limit_pause(exc: BaseException | None) -> float | None:
+    """Return seconds to pause if an exception indicates rate limiting."""
+    limited = False
+    while exc is not None:
+        if getattr(exc, "code", None) == ERROR_RATE_LIMIT:
+            limited = True
+        if isinstance(exc, aiohttp.ClientResponseError) and exc.status == 429:
+            limited = True
+            if exc.headers and (value := exc.headers.get("Retry-After")):
+                return _parse_retry_after(value)
+        exc = exc.__cause__
+    return RATE_LIMIT_PAUSE if limited else None
+
+
+def _parse_retry_after(value: str) -> float:
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        until = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return RATE_LIMIT_PAUSE
+    return max(0.0, (until - dt_util.utcnow()).total_seconds())
+
+
+class RequestBudget:
+    """Token bucket of requests, shared by all uplinks using a client id.
+
+    Requests wait in turn for a token when the budget is exhausted, and
+    the budget is emptied for as long as the api asks when rate limited.
+    """
+
+    def __init__(
+        self, capacity: int = BUDGET_CAPACITY, per_minute: float = BUDGET_PER_MINUTE
+    ) -> None:
+        """Init."""
+        self.capacity = capacity
+        self.per_minute = per_minute
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.per_minute / 60,
+            )
+            self._updated = now
+
+    @property
+    def remaining(self) -> int:
+        """Return number of requests that can be made right away."""
+        self._refill(time.monotonic())
+        return int(self._tokens)
+
+    async def acquire(self) -> None:
+        """Wait for and consume one request from the budget."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                # Refill starts at the end of any pause
+                delay = max(0.0, self._updated - now)
+                delay += (1 - self._tokens) * 60 / self.per_minute
+                _LOGGER.debug("Request budget exhausted, waiting %.1f seconds", delay)
+                await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Empty the budget, and hold off refilling for a number of seconds."""
+        _LOGGER.warning(
+            "Rate limited by nibe uplink, pausing for %.0f seconds", seconds
+        )
+        self._refill(now := time.monotonic())
+        self._tokens = 0.0
+        self._updated = max(self._updated, now + seconds)
+
+    def as_dict(self) -> dict[str, float]:
+        """Return state for diagnostics."""
+        return {
+            "capacity": self.capacity,
+            "per_minute": self.per_minute,
+            "remaining": self.remaining,
+        }
+
+
+class AdaptiveThrottle:
+    """Throttle uplink requests, adapting the rate to how the api responds.
+
+    Drop in replacement for the fixed throttle of the library. The library
+    serializes all requests of an uplink, so the limit is expressed as
+    requests per minute. It increases additively while requests succeed
+    quickly, and is cut multiplicatively on slow responses, timeouts and
+    rate limiting. Each request also takes from the shared budget of
+    the account, whose refill rate caps the limit. The refill rate is
+    configurable, leaving room for the limit to grow above its start.
+    """
+
+    def __init__(self, budget: RequestBudget, limit: float = INITIAL_LIMIT) -> None:
+        """Init."""
+        self.budget = budget
+        self.limit = min(limit, budget.per_minute)
+        self.latency: float | None = None
+        self._next = 0.0
+        self._start = 0.0
+
+    async def __aenter__(self):
+        """Wait until the next request is allowed."""
+        if (delay := self._next - time.monotonic()) > 0:
+            _LOGGER.debug("Delaying request by %.1f seconds due to throttle", delay)
+            await asyncio.sleep(delay)
+        await self.budget.acquire()
+        self._start = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Adapt the limit to the outcome of the request."""
+        now = time.monotonic()
+        latency = now - self._start
+        self.latency = latency
+
+        if (pause := rate_limit_pause(exc_val)) is not None:
+            self.budget.pause(pause)
+
+        if is_congestion(exc_val):
+            self._decrease(BACKOFF_FACTOR, f"congestion ({exc_val!r})")
+        elif exc_val is None:
+            if latency > SLOW_RESPONSE:
+                self._decrease(SLOW_FACTOR, f"slow response ({latency:.1f} s)")
+            else:
+                # Adds one request per minute for each limit worth of requests,
+                # up to the rate the shared budget refills at
+                self.limit = min(self.budget.per_minute, self.limit + 1 / self.limit)
+
+        self._next = now + 60 / self.limit
+
+    def _decrease(self, factor: float, reason: str) -> None:
+        self.limit = max(MIN_LIMIT, self.limit * factor)
+        _LOGGER.debug(
+            "Reducing request limit to %.1f per minute due to %s", self.limit, reason
+        )
+
+    def as_dict(self) -> dict[str, float | None]:
+        """Return state for diagnostics."""
+        return {
+            "limit_per_minute": round(self.limit, 2),
+            "last_latency": None if self.latency is None else round(self.latency, 3),
+        }
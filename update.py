@@ -6,18 +6,21 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import NibeData, NibeSystem
-from .const import DATA_NIBE_ENTRIES, DOMAIN
+from . import NibeSystem
+from .const import DOMAIN
+from .entity import async_remove_with_system, async_setup_systems
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
 ):
     """Set up the device based on a config entry."""
-    data: NibeData = hass.data[DATA_NIBE_ENTRIES][entry.entry_id]
 
-    entities = [NibeUpdateSensor(system) for system in data.systems.values()]
-    async_add_entities(entities, False)
+    async def add_systems(systems: list[NibeSystem]):
+        entities = [NibeUpdateSensor(system) for system in systems]
+        async_add_entities(entities, False)
+
+    await async_setup_systems(hass, entry, add_systems)
 
 
 class NibeUpdateSensor(CoordinatorEntity[NibeSystem], UpdateEntity):
@@ -31,6 +34,11 @@ class NibeUpdateSensor(CoordinatorEntity[NibeSystem], UpdateEntity):
         self._attr_unique_id = f"{system.system_id}_system_update"
         self.entity_id = ENTITY_ID_FORMAT.format(f"{DOMAIN}_{system.system_id}_update")
 
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        async_remove_with_system(self, self.coordinator.system_id)
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Update when the coordinator updates."""
@@ -1,9 +1,9 @@
 """Water heater entity for nibe uplink."""
 from __future__ import annotations
 
-import asyncio
 import logging
 from collections import OrderedDict
+from typing import TYPE_CHECKING
 
 import aiohttp
 from homeassistant.components.water_heater import (
@@ -17,13 +17,13 @@ from homeassistant.components.water_heater import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import STATE_OFF, UnitOfTemperature
 from homeassistant.core import HomeAssistant
-from nibeuplink import get_active_hotwater
-from nibeuplink.types import HotWaterSystem
 
-from . import NibeData, NibeSystem
-from .const import DATA_NIBE_ENTRIES
+from . import NibeSystem
 from .const import DOMAIN as DOMAIN_NIBE
-from .entity import NibeEntity
+from .entity import NibeEntity, async_load_entities, async_setup_systems
+
+if TYPE_CHECKING:
+    from nibeuplink.types import HotWaterSystem
 
 PARALLEL_UPDATES = 0
 _LOGGER = logging.getLogger(__name__)
@@ -67,25 +67,24 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
 ):
     """Set up the climate device based on a config entry."""
-    data: NibeData = hass.data[DATA_NIBE_ENTRIES][entry.entry_id]
-    uplink = data.uplink
-    systems = data.systems
-
-    entities = []
 
-    async def add_active(system: NibeSystem):
-        hwsyses = await get_active_hotwater(uplink, system.system_id)
-        for hwsys in hwsyses.values():
-            entities.append(NibeWaterHeater(system, hwsys))
+    async def add_systems(systems: list[NibeSystem]):
+        entities = []
+        for system in systems:
+            for hwsys in system.hotwaters:
+                entities.append(NibeWaterHeater(system, hwsys))
 
-    await asyncio.gather(*[add_active(system) for system in systems.values()])
+        await async_load_entities(entities)
+        async_add_entities(entities)
 
-    async_add_entities(entities, True)
+    await async_setup_systems(hass, entry, add_systems)
 
 
 class NibeWaterHeater(NibeEntity, WaterHeaterEntity):
     """Water heater entity."""
 
+    _uses_statuses = True
+
     def __init__(self, system: NibeSystem, hwsys: HotWaterSystem):
         """Init."""
         parameters = {
@@ -130,6 +129,7 @@ class NibeWaterHeater(NibeEntity, WaterHeaterEntity):
         data["current_temperature"] = self.current_temperature
         data["target_temp_low"] = self.target_temperature_low
         data["target_temp_high"] = self.target_temperature_high
+        data["stale"] = self._system.stale
         return data
 
     @property
@@ -194,8 +194,7 @@ class NibeWaterHeater(NibeEntity, WaterHeaterEntity):
             )
 
         try:
-            await self._uplink.put_parameter(
-                self._system_id,
+            await self._system.put_parameter(
                 self._hwsys.hot_water_boost,
                 boost,
             )